@@ -5,20 +5,8 @@ from typing import List, Sequence
 
 
 def parse_callsign_lines(lines: Sequence[str]) -> List[str]:
-    calls: List[str] = []
-    seen = set()
-    for raw in lines:
-        line = raw.strip().lstrip("\ufeff")
-        if not line or line.startswith("#"):
-            continue
-        first = line.split(",", 1)[0].strip().upper()
-        if not first or first.startswith("#"):
-            continue
-        if first in seen:
-            continue
-        seen.add(first)
-        calls.append(first)
-    return calls
+    # dict.fromkeys dedupes in insertion order with a single hash per line.
+    return list(dict.fromkeys(call for call in map(_extract_callsign, lines) if call))
 
 
 def parse_callsign_text(text: str) -> List[str]:
@@ -29,3 +17,13 @@ def load_callsigns_file(path: str | Path) -> List[str]:
     p = Path(path)
     data = p.read_text(encoding="utf-8", errors="ignore")
     return parse_callsign_text(data)
+
+
+def _extract_callsign(raw: str) -> str:
+    line = raw.strip().lstrip("\ufeff")
+    if not line or line.startswith("#"):
+        return ""
+    first = line.split(",", 1)[0].strip().upper()
+    if first.startswith("#"):
+        return ""
+    return first
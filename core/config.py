@@ -1,11 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass, field
+from dataclasses import asdict, dataclass, field, fields, is_dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import yaml
 
+try:
+    from yaml import CSafeDumper as _YamlDumper, CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeDumper as _YamlDumper, SafeLoader as _YamlLoader
+
 from .decoder import CWDecoderConfig
 from .encoder import CWEncoderConfig
 from .qso_state_machine import QSOConfig
@@ -36,7 +41,7 @@ def load_config(path: str | Path) -> AppConfig:
         save_config(p, cfg)
         return cfg
 
-    raw = yaml.safe_load(p.read_text(encoding="utf-8")) or {}
+    raw = yaml.load(p.read_text(encoding="utf-8"), Loader=_YamlLoader) or {}
     cfg = AppConfig()
 
     _apply_dataclass_updates(cfg.audio, raw.get("audio", {}))
@@ -46,6 +51,9 @@ def load_config(path: str | Path) -> AppConfig:
     _apply_dataclass_updates(cfg.qso, raw.get("qso", {}))
     cfg.qso.max_stations = max(1, int(cfg.qso.max_stations))
     cfg.qso.p2p_probability = max(0.0, min(1.0, float(cfg.qso.p2p_probability)))
+    # YAML yields a list (or None / a bare string); keep the declared tuple so the
+    # state machine's config cache key can reuse it as-is.
+    cfg.qso.ignore_fill_tokens = _normalize_tokens(cfg.qso.ignore_fill_tokens)
 
     # Backward compatibility: old configs only had fixed wpm/tone_hz.
     has_wpm_start = "wpm_out_start" in encoder_raw
@@ -92,13 +100,33 @@ def load_config(path: str | Path) -> AppConfig:
 
 def save_config(path: str | Path, config: AppConfig) -> None:
     payload = {
-        "audio": asdict(config.audio),
-        "decoder": asdict(config.decoder),
-        "encoder": asdict(config.encoder),
-        "qso": asdict(config.qso),
+        "audio": _shallow_asdict(config.audio),
+        "decoder": _shallow_asdict(config.decoder),
+        "encoder": _shallow_asdict(config.encoder),
+        "qso": _shallow_asdict(config.qso),
     }
     p = Path(path)
-    p.write_text(yaml.safe_dump(payload, sort_keys=False, allow_unicode=False), encoding="utf-8")
+    p.write_text(
+        yaml.dump(payload, Dumper=_YamlDumper, sort_keys=False, allow_unicode=False),
+        encoding="utf-8",
+    )
+
+
+def _shallow_asdict(obj: Any) -> Dict[str, Any]:
+    # Config sections are flat scalars, so skip asdict's recursive deep copy
+    # unless a field actually nests another dataclass.
+    out = {f.name: getattr(obj, f.name) for f in fields(obj)}
+    if any(is_dataclass(value) for value in out.values()):
+        return asdict(obj)
+    return out
+
+
+def _normalize_tokens(value: Any) -> Tuple[str, ...]:
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        value = (value,)
+    return tuple(str(token).strip().upper() for token in value)
 
 
 def _apply_dataclass_updates(target: Any, updates: Dict[str, Any]) -> None:
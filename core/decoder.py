@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import math
 from collections import deque
 from dataclasses import dataclass
-from typing import Deque, List, Optional, Sequence, Tuple
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 
-from .morse import MORSE_CODE, MORSE_DECODE
+from .morse import EMPTY_PACKED_PATTERN, MORSE_CODE, MORSE_DECODE_PACKED, pack_morse_pattern
+
+try:
+    from numba import njit
+except Exception:  # pragma: no cover - optional accelerator
+    njit = None
 
 
 @dataclass
@@ -63,11 +69,21 @@ class CWDecoder:
         self.config = config
         self.frame_len = max(int(round(config.sample_rate * config.frame_ms / 1000.0)), 16)
         self.frame_duration = self.frame_len / float(config.sample_rate)
-        self._buffer = np.zeros(0, dtype=np.float32)
+        self._buffer = np.empty(self.frame_len * 8, dtype=np.float32)
+        self._buffer_read = 0
+        self._buffer_write = 0
 
         self._tone_hz = float(config.target_tone_hz)
         self._tone_update_every = 5
         self._tone_update_countdown = 0
+        self._goertzel_n_inv = 1.0 / float(self.frame_len * self.frame_len)
+        self._goertzel_coeff = 0.0
+        self._goertzel_basis: Optional[np.ndarray] = None
+        self._goertzel_coeff_freq: Optional[float] = None
+
+        self._fft_window = np.hanning(self.frame_len).astype(np.float32)
+        self._fft_freqs = np.fft.rfftfreq(self.frame_len, 1.0 / config.sample_rate)
+        self.apply_config()
 
         self._noise_floor = 1e-8
         self._tone_power_smooth = 0.0
@@ -77,14 +93,18 @@ class CWDecoder:
         self._pending_duration = 0.0
 
         self._dot_estimate = float(config.dot_seconds_fixed)
-        self._down_durations: Deque[float] = deque(maxlen=256)
+        # Recent key-down durations as a ring buffer feeding the auto-WPM estimate.
+        self._down_durations = np.empty(_DURATION_HISTORY, dtype=np.float32)
+        self._down_count = 0
+        self._down_index = 0
         self._up_durations: Deque[float] = deque(maxlen=256)
 
-        self._current_symbol = ""
-        self._current_word = ""
+        # Elements keyed so far, packed as bits (dot=0, dash=1) under a leading 1.
+        self._symbol_code = _EMPTY_SYMBOL
+        self._current_word: List[str] = []
         self._message_words: List[str] = []
 
-        self._morse_decode = dict(MORSE_DECODE)
+        self._morse_lookup: Dict[int, str] = dict(MORSE_DECODE_PACKED)
         self._register_configured_prosign(config.prosign_literal)
 
         self._gap_flushed_symbol = False
@@ -97,8 +117,38 @@ class CWDecoder:
             wpm_est=1.2 / self._dot_estimate,
         )
 
+    def apply_config(self) -> None:
+        """
+        Snapshot the tuning fields of ``self.config`` used per frame.
+
+        Call after editing the config in place. Sample rate and frame length
+        size the decoder's buffers, so changing them needs a new decoder.
+        """
+        cfg = self.config
+        self._auto_tone = bool(cfg.auto_tone)
+        self._auto_wpm = bool(cfg.auto_wpm)
+        self._fft_lo = int(np.searchsorted(self._fft_freqs, cfg.tone_search_min_hz, side="left"))
+        self._fft_hi = int(np.searchsorted(self._fft_freqs, cfg.tone_search_max_hz, side="right"))
+        self._thr_on_mult = float(cfg.threshold_on_mult)
+        self._thr_off_mult = float(cfg.threshold_off_mult)
+        self._agc_alpha = min(max(float(cfg.agc_alpha), 0.001), 0.5)
+        self._power_smooth_alpha = min(max(float(cfg.power_smooth_alpha), 0.01), 1.0)
+        self._dash_thr_dots = max(1.6, float(cfg.dash_threshold_dots))
+        self._gap_char_dots = float(cfg.gap_char_threshold_dots)
+        self._gap_word_dots = float(cfg.gap_word_threshold_dots)
+        self._msg_gap_dots = float(cfg.message_gap_dots)
+        sec = cfg.message_gap_seconds
+        self._msg_gap_sec = float(sec) if sec is not None and sec > 0.0 else None
+        self._min_down_s = cfg.min_key_down_ms / 1000.0
+        self._min_up_s = cfg.min_key_up_ms / 1000.0
+        self._min_down_ratio = min(max(float(cfg.min_key_down_dot_ratio), 0.0), 1.0)
+        self._min_up_ratio = min(max(float(cfg.min_key_up_dot_ratio), 0.0), 1.0)
+        self._dot_min_s = cfg.dot_ms_min / 1000.0
+        self._dot_max_s = cfg.dot_ms_max / 1000.0
+
     def reset(self) -> None:
-        self._buffer = np.zeros(0, dtype=np.float32)
+        self._buffer_read = 0
+        self._buffer_write = 0
         self._noise_floor = 1e-8
         self._tone_power_smooth = 0.0
         self._state_down = False
@@ -106,10 +156,11 @@ class CWDecoder:
         self._pending_state = None
         self._pending_duration = 0.0
         self._dot_estimate = float(self.config.dot_seconds_fixed)
-        self._down_durations.clear()
+        self._down_count = 0
+        self._down_index = 0
         self._up_durations.clear()
-        self._current_symbol = ""
-        self._current_word = ""
+        self._symbol_code = _EMPTY_SYMBOL
+        self._current_word.clear()
         self._message_words.clear()
         self._gap_flushed_symbol = False
         self._gap_flushed_word = False
@@ -121,7 +172,8 @@ class CWDecoder:
         self._tone_power_smooth = 0.0
         self._pending_state = None
         self._pending_duration = 0.0
-        self._down_durations.clear()
+        self._down_count = 0
+        self._down_index = 0
         self._up_durations.clear()
 
     def calibrate_noise_floor_from_samples(self, samples: np.ndarray, *, percentile: float = 75.0) -> float:
@@ -131,11 +183,14 @@ class CWDecoder:
 
         # During calibration we only estimate the baseline tone power at the current RX tone.
         # A percentile (instead of max) is more robust to short transients.
-        p = float(np.clip(percentile, 5.0, 95.0))
+        p = min(max(float(percentile), 5.0), 95.0)
+        self._refresh_goertzel_coeff()
         powers: List[float] = []
         for i in range(0, mono.size - self.frame_len + 1, self.frame_len):
             frame = mono[i : i + self.frame_len]
-            powers.append(_goertzel_power(frame, self.config.sample_rate, self._tone_hz))
+            powers.append(
+                _goertzel_power(frame, self._goertzel_coeff, self._goertzel_n_inv, self._goertzel_basis)
+            )
 
         if not powers:
             raise ValueError("No complete frames available for noise calibration.")
@@ -146,21 +201,36 @@ class CWDecoder:
         self.stats.tone_hz = self._tone_hz
         self.stats.tone_power = floor
         self.stats.noise_floor = floor
-        self.stats.threshold_on = max(floor * self.config.threshold_on_mult, 1e-12)
-        self.stats.threshold_off = max(floor * self.config.threshold_off_mult, 1e-12)
+        self.stats.threshold_on = max(floor * self._thr_on_mult, 1e-12)
+        self.stats.threshold_off = max(floor * self._thr_off_mult, 1e-12)
         return floor
 
     def process_samples(self, samples: np.ndarray) -> List[str]:
         if samples.size == 0:
             return []
         mono = _to_mono_float32(samples)
-        self._buffer = np.concatenate([self._buffer, mono], dtype=np.float32)
         out_messages: List[str] = []
-
-        while self._buffer.size >= self.frame_len:
-            frame = self._buffer[: self.frame_len]
-            self._buffer = self._buffer[self.frame_len :]
-            self._process_frame(frame, out_messages)
+        buf = self._buffer
+        frame_len = self.frame_len
+        pos = 0
+        while pos < mono.size:
+            n = min(mono.size - pos, buf.size - self._buffer_write)
+            buf[self._buffer_write : self._buffer_write + n] = mono[pos : pos + n]
+            self._buffer_write += n
+            pos += n
+
+            while self._buffer_write - self._buffer_read >= frame_len:
+                frame = buf[self._buffer_read : self._buffer_read + frame_len]
+                self._buffer_read += frame_len
+                self._process_frame(frame, out_messages)
+
+            # Less than one frame is left unread here; slide it back to the start
+            # once the read cursor passes the middle so writes never run out of room.
+            if self._buffer_read > buf.size // 2:
+                remaining = self._buffer_write - self._buffer_read
+                buf[:remaining] = buf[self._buffer_read : self._buffer_write]
+                self._buffer_read = 0
+                self._buffer_write = remaining
         return out_messages
 
     def finalize(self) -> List[str]:
@@ -179,17 +249,15 @@ class CWDecoder:
         return " ".join(m for m in messages if m).strip()
 
     def _process_frame(self, frame: np.ndarray, out_messages: List[str]) -> None:
-        frame = frame.astype(np.float32, copy=False)
-        rms = float(np.sqrt(np.mean(frame * frame) + 1e-12))
-        self.stats.level_db = 20.0 * np.log10(max(rms, 1e-12))
-
-        if self.config.auto_tone:
+        # Frames are views of the float32 ring buffer; no per-frame conversion.
+        if self._auto_tone:
             if self._tone_update_countdown <= 0:
                 tone = _dominant_freq_fft(
                     frame,
-                    self.config.sample_rate,
-                    self.config.tone_search_min_hz,
-                    self.config.tone_search_max_hz,
+                    self._fft_window,
+                    self._fft_freqs,
+                    self._fft_lo,
+                    self._fft_hi,
                 )
                 if tone is not None:
                     self._tone_hz = 0.8 * self._tone_hz + 0.2 * tone
@@ -197,8 +265,18 @@ class CWDecoder:
             else:
                 self._tone_update_countdown -= 1
 
-        tone_power_raw = _goertzel_power(frame, self.config.sample_rate, self._tone_hz)
-        alpha_p = float(np.clip(self.config.power_smooth_alpha, 0.01, 1.0))
+        # Auto-tone has settled this frame's RX tone, so one fused pass suffices.
+        self._refresh_goertzel_coeff()
+        tone_power_raw, sum_sq = _goertzel_power_and_energy(
+            frame,
+            self._goertzel_coeff,
+            self._goertzel_n_inv,
+            self._goertzel_basis,
+        )
+        rms = math.sqrt(sum_sq / max(frame.size, 1) + 1e-12)
+        self.stats.level_db = 20.0 * math.log10(max(rms, 1e-12))
+
+        alpha_p = self._power_smooth_alpha
         if self._tone_power_smooth <= 0.0:
             self._tone_power_smooth = tone_power_raw
         else:
@@ -206,11 +284,11 @@ class CWDecoder:
         tone_power = self._tone_power_smooth
 
         if not self._state_down and self._pending_state is None:
-            alpha = float(np.clip(self.config.agc_alpha, 0.001, 0.5))
+            alpha = self._agc_alpha
             self._noise_floor = (1.0 - alpha) * self._noise_floor + alpha * tone_power
 
-        threshold_on = max(self._noise_floor * self.config.threshold_on_mult, 1e-12)
-        threshold_off = max(self._noise_floor * self.config.threshold_off_mult, 1e-12)
+        threshold_on = max(self._noise_floor * self._thr_on_mult, 1e-12)
+        threshold_off = max(self._noise_floor * self._thr_off_mult, 1e-12)
 
         if self._state_down:
             raw_down = tone_power >= threshold_off
@@ -231,15 +309,27 @@ class CWDecoder:
         self.stats.threshold_on = threshold_on
         self.stats.threshold_off = threshold_off
 
+    def _refresh_goertzel_coeff(self) -> None:
+        if self._goertzel_coeff_freq == self._tone_hz:
+            return
+        self._goertzel_coeff, self._goertzel_basis = _goertzel_setup(
+            self.config.sample_rate,
+            self._tone_hz,
+            self.frame_len,
+        )
+        self._goertzel_coeff_freq = self._tone_hz
+
     def _on_transition(self, prev_state_down: bool, duration: float) -> None:
         if duration <= 0.0:
             return
         if prev_state_down:
-            self._down_durations.append(duration)
+            self._down_durations[self._down_index] = duration
+            self._down_index = (self._down_index + 1) % _DURATION_HISTORY
+            self._down_count = min(self._down_count + 1, _DURATION_HISTORY)
             self._maybe_update_dot_estimate()
             dot = self._dot_estimate
-            dash_threshold = max(1.6, float(self.config.dash_threshold_dots)) * dot
-            self._current_symbol += "." if duration < dash_threshold else "-"
+            dash_threshold = self._dash_thr_dots * dot
+            self._symbol_code = (self._symbol_code << 1) | (0 if duration < dash_threshold else 1)
             return
 
         self._up_durations.append(duration)
@@ -280,21 +370,17 @@ class CWDecoder:
         self._pending_duration = 0.0
 
     def _min_key_durations(self) -> Tuple[float, float]:
-        dot_ref = max(self._dot_estimate, self.config.dot_ms_min / 1000.0)
-        min_down = max(
-            self.config.min_key_down_ms / 1000.0,
-            float(np.clip(self.config.min_key_down_dot_ratio, 0.0, 1.0)) * dot_ref,
-        )
-        min_up = max(
-            self.config.min_key_up_ms / 1000.0,
-            float(np.clip(self.config.min_key_up_dot_ratio, 0.0, 1.0)) * dot_ref,
-        )
+        dot_ref = max(self._dot_estimate, self._dot_min_s)
+        min_down = max(self._min_down_s, self._min_down_ratio * dot_ref)
+        min_up = max(self._min_up_s, self._min_up_ratio * dot_ref)
         return min_down, min_up
 
     def _classify_gap(self, gap_seconds: float) -> None:
-        dot = self._dot_estimate
-        char_threshold = max(1.6, float(self.config.gap_char_threshold_dots)) * dot
-        word_threshold = max(char_threshold + 0.8 * dot, float(self.config.gap_word_threshold_dots) * dot)
+        char_threshold, word_threshold = _gap_thresholds(
+            self._dot_estimate,
+            self._gap_char_dots,
+            self._gap_word_dots,
+        )
         if gap_seconds < char_threshold:
             return
         if gap_seconds < word_threshold:
@@ -306,8 +392,11 @@ class CWDecoder:
     def _handle_gap_progress(self, out_messages: List[str]) -> None:
         dot = self._dot_estimate
         gap = self._state_duration
-        char_threshold = max(1.6, float(self.config.gap_char_threshold_dots)) * dot
-        word_threshold = max(char_threshold + 0.8 * dot, float(self.config.gap_word_threshold_dots) * dot)
+        char_threshold, word_threshold = _gap_thresholds(
+            dot,
+            self._gap_char_dots,
+            self._gap_word_dots,
+        )
         if gap >= char_threshold and not self._gap_flushed_symbol:
             self._flush_symbol()
             self._gap_flushed_symbol = True
@@ -323,23 +412,23 @@ class CWDecoder:
             self._gap_emitted_message = True
 
     def _resolve_message_gap_seconds(self, dot_seconds: float) -> float:
-        sec = self.config.message_gap_seconds
-        if sec is not None and sec > 0.0:
-            return max(float(sec), self.frame_duration)
-        return max(float(self.config.message_gap_dots) * dot_seconds, self.frame_duration)
+        sec = self._msg_gap_sec
+        if sec is not None:
+            return max(sec, self.frame_duration)
+        return max(self._msg_gap_dots * dot_seconds, self.frame_duration)
 
     def _flush_symbol(self) -> None:
-        if not self._current_symbol:
+        if self._symbol_code == _EMPTY_SYMBOL:
             return
-        char = self._morse_decode.get(self._current_symbol, "")
+        char = self._morse_lookup.get(self._symbol_code, "")
         if char:
-            self._current_word += char
-        self._current_symbol = ""
+            self._current_word.append(char)
+        self._symbol_code = _EMPTY_SYMBOL
 
     def _flush_word(self) -> None:
         if self._current_word:
-            self._message_words.append(self._current_word)
-            self._current_word = ""
+            self._message_words.append("".join(self._current_word))
+            self._current_word.clear()
 
     def _flush_message(self) -> str:
         if not self._message_words:
@@ -349,17 +438,17 @@ class CWDecoder:
         return msg
 
     def _maybe_update_dot_estimate(self) -> None:
-        if not self.config.auto_wpm or len(self._down_durations) < 6:
+        if not self._auto_wpm or self._down_count < 6:
             return
-        down = np.array(self._down_durations, dtype=np.float32)
-        down.sort()
-        half = max(len(down) // 2, 1)
-        short = down[:half]
-        dot = float(np.median(short))
-
-        dot_min = self.config.dot_ms_min / 1000.0
-        dot_max = self.config.dot_ms_max / 1000.0
-        dot = float(np.clip(dot, dot_min, dot_max))
+        half = max(self._down_count // 2, 1)
+        # Median of the shorter half: only the one or two middle order
+        # statistics of that half are needed, so partition instead of sorting.
+        # np.partition returns a copy, leaving the ring's write order intact.
+        lo, hi = (half - 1) // 2, half // 2
+        down = np.partition(self._down_durations[: self._down_count], (lo, hi))
+        dot = 0.5 * (float(down[lo]) + float(down[hi]))
+
+        dot = min(max(dot, self._dot_min_s), self._dot_max_s)
         self._dot_estimate = 0.85 * self._dot_estimate + 0.15 * dot
 
     def _register_configured_prosign(self, literal: str) -> None:
@@ -373,53 +462,92 @@ class CWDecoder:
                 return
             pattern_parts.append(code)
         pattern = "".join(pattern_parts)
-        self._morse_decode[pattern] = f"<{lit}>"
+        self._morse_lookup[pack_morse_pattern(pattern)] = f"<{lit}>"
+
+
+_EMPTY_SYMBOL = EMPTY_PACKED_PATTERN
+_DURATION_HISTORY = 256
+
+
+def _gap_thresholds(dot: float, char_dots: float, word_dots: float) -> Tuple[float, float]:
+    char_threshold = max(1.6, float(char_dots)) * dot
+    word_threshold = max(char_threshold + 0.8 * dot, float(word_dots) * dot)
+    return char_threshold, word_threshold
 
 
 def _to_mono_float32(samples: np.ndarray) -> np.ndarray:
+    # Everything downstream (ring buffer, Goertzel kernel) assumes contiguous float32.
     arr = np.asarray(samples, dtype=np.float32)
     if arr.ndim == 1:
-        return arr
+        return np.ascontiguousarray(arr)
     if arr.ndim == 2:
-        return arr.mean(axis=1, dtype=np.float32)
-    return arr.reshape(-1).astype(np.float32, copy=False)
+        return np.ascontiguousarray(arr.mean(axis=1, dtype=np.float32))
+    return arr.reshape(-1)
 
 
 def _dominant_freq_fft(
     frame: np.ndarray,
-    sample_rate: int,
-    min_hz: float,
-    max_hz: float,
+    window: np.ndarray,
+    freqs: np.ndarray,
+    lo_bin: int,
+    hi_bin: int,
 ) -> Optional[float]:
-    n = frame.size
-    if n < 32:
-        return None
-    win = np.hanning(n).astype(np.float32)
-    spec = np.fft.rfft(frame * win)
-    freqs = np.fft.rfftfreq(n, 1.0 / sample_rate)
-    mask = (freqs >= min_hz) & (freqs <= max_hz)
-    if not np.any(mask):
-        return None
-    mags = np.abs(spec[mask])
-    if mags.size == 0:
+    if frame.size < 32 or hi_bin <= lo_bin:
         return None
-    idx = int(np.argmax(mags))
-    tone = float(freqs[mask][idx])
-    return tone
-
-
-def _goertzel_power(frame: np.ndarray, sample_rate: int, freq_hz: float) -> float:
-    n = frame.size
-    if n == 0:
-        return 0.0
-    omega = 2.0 * np.pi * freq_hz / sample_rate
-    coeff = 2.0 * np.cos(omega)
-    q0 = 0.0
-    q1 = 0.0
-    q2 = 0.0
-    for sample in frame:
-        q0 = coeff * q1 - q2 + float(sample)
-        q2 = q1
-        q1 = q0
-    power = q1 * q1 + q2 * q2 - coeff * q1 * q2
-    return float(max(power, 0.0) / max(n * n, 1))
+    spec = np.fft.rfft(frame * window)
+    idx = int(np.abs(spec[lo_bin:hi_bin]).argmax()) + lo_bin
+    return float(freqs[idx])
+
+
+def _goertzel_setup(sample_rate: int, freq_hz: float, n: int) -> Tuple[float, Optional[np.ndarray]]:
+    omega = 2.0 * math.pi * freq_hz / sample_rate
+    coeff = 2.0 * math.cos(omega)
+    if _goertzel_kernel is not None:
+        return coeff, None
+    # Goertzel power equals |sum(x[k] * exp(-j*omega*k))|^2, so without numba
+    # the serial recurrence is replaced by a projection on a cos/sin basis.
+    t = omega * np.arange(n, dtype=np.float64)
+    return coeff, np.vstack((np.cos(t), np.sin(t)))
+
+
+def _goertzel_power(frame: np.ndarray, coeff: float, n_inv: float, basis: Optional[np.ndarray] = None) -> float:
+    return _goertzel_power_and_energy(frame, coeff, n_inv, basis)[0]
+
+
+def _goertzel_power_and_energy(
+    frame: np.ndarray,
+    coeff: float,
+    n_inv: float,
+    basis: Optional[np.ndarray] = None,
+) -> Tuple[float, float]:
+    """Return (normalised tone power, sum of squares) of a frame in one pass."""
+    if frame.size == 0:
+        return 0.0, 0.0
+    if basis is None:
+        power, sum_sq = _goertzel_kernel(frame, coeff)
+    else:
+        re_part, im_part = basis @ frame
+        power = re_part * re_part + im_part * im_part
+        sum_sq = np.dot(frame, frame)
+    return float(max(power, 0.0) * n_inv), float(sum_sq)
+
+
+if njit is not None:
+
+    @njit(cache=True, fastmath=True)
+    def _goertzel_kernel(frame, coeff):  # pragma: no cover - compiled by numba
+        q1 = 0.0
+        q2 = 0.0
+        sum_sq = 0.0
+        for i in range(frame.size):
+            x = frame[i]
+            q0 = coeff * q1 - q2 + x
+            q2 = q1
+            q1 = q0
+            sum_sq += x * x
+        return q1 * q1 + q2 * q2 - coeff * q1 * q2, sum_sq
+
+    # Pay the JIT compilation cost at import time rather than on the first audio block.
+    _goertzel_kernel(np.zeros(16, dtype=np.float32), 1.0)
+else:
+    _goertzel_kernel = None
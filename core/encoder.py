@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
-from typing import List, Optional, Sequence, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import numpy as np
 
-from .morse import token_to_morse_letters, tokenize_text
+from .morse import MORSE_PACKED, iter_token_chars, tokenize_text
+from .tone import PHASE_MODULUS, PHASE_SHIFT, SINE_TABLE, phase_step
 
 try:
     import sounddevice as sd
@@ -45,78 +47,152 @@ class CWEncoderConfig:
 class CWEncoder:
     def __init__(self, config: CWEncoderConfig):
         self.config = config
+        self._envelope_key: Optional[Tuple[int, float, float]] = None
+        self._attack_env = np.zeros(0, dtype=np.float32)
+        self._release_env = np.zeros(0, dtype=np.float32)
+        self._short_ramps: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self._sine_key: Optional[Tuple[int, float]] = None
+        self._sine_table = np.zeros(1, dtype=np.float32)
+        self._phase_step = 0
+        self._phase_modulus = 1
+        self._phase_shift = 0
 
     def text_to_pulses(self, text: str) -> List[Pulse]:
+        return list(self._emit_pulses(text))
+
+    def _emit_pulses(self, text: str) -> Iterator[Pulse]:
+        """Yield alternating key-down/key-up pulses; adjacent gaps are merged as they accrue."""
         tokens = tokenize_text(text)
-        pulses: List[Pulse] = []
         dot = self.config.dot_seconds
         char_gap = 3.0 * self.config.space_dot_seconds
         word_gap = 7.0 * self.config.space_dot_seconds
         prosign_tokens = {tok.upper() for tok in self.config.prosign_tokens}
 
+        gap = 0.0
         for token_idx, token in enumerate(tokens):
-            letters = token_to_morse_letters(token)
+            # Tokens only ever hold ASCII (see TOKEN_RE), so ord() indexes the table directly.
+            letters = [MORSE_PACKED[ord(ch)] for ch in iter_token_chars(token)]
+            letters = [code for code in letters if code]
             if not letters:
                 continue
 
             is_prosign = (token.startswith("<") and token.endswith(">")) or (token in prosign_tokens)
             letter_gap = dot if is_prosign else char_gap
-            for letter_idx, morse in enumerate(letters):
-                for element_idx, element in enumerate(morse):
-                    pulses.append((True, dot if element == "." else 3.0 * dot))
-                    if element_idx < len(morse) - 1:
-                        pulses.append((False, dot))
+            for letter_idx, code in enumerate(letters):
+                for shift in range(code.bit_length() - 2, -1, -1):
+                    if gap > 0.0:
+                        yield (False, gap)
+                        gap = 0.0
+                    yield (True, 3.0 * dot if (code >> shift) & 1 else dot)
+                    if shift:
+                        gap += dot
                 if letter_idx < len(letters) - 1:
-                    pulses.append((False, letter_gap))
+                    gap += letter_gap
 
             if token_idx < len(tokens) - 1:
-                pulses.append((False, word_gap))
+                gap += word_gap
 
-        return _merge_same_state_pulses(pulses)
+        if gap > 0.0:
+            yield (False, gap)
 
     def encode_to_audio(self, text: str) -> np.ndarray:
-        pulses = self.text_to_pulses(text)
-        if not pulses:
-            return np.zeros(1, dtype=np.float32)
-
         sr = self.config.sample_rate
-        tone = self.config.tone_hz
-        volume = float(np.clip(self.config.volume, 0.0, 1.0))
-        attack_samples = max(int(sr * self.config.attack_ms / 1000.0), 0)
-        release_samples = max(int(sr * self.config.release_ms / 1000.0), 0)
-
-        chunks: List[np.ndarray] = []
-        phase = 0.0
-        phase_step = 2.0 * np.pi * tone / sr
-
-        for is_on, duration_sec in pulses:
+        # Single walk over the pulses: record where each key-down segment lands,
+        # then size the buffer once and synthesize only those segments.
+        on_starts = array("q")
+        on_sizes = array("q")
+        offset = 0
+        for is_on, duration_sec in self._emit_pulses(text):
             n = max(int(round(duration_sec * sr)), 1)
-            if not is_on:
-                chunks.append(np.zeros(n, dtype=np.float32))
-                continue
+            if is_on:
+                on_starts.append(offset)
+                on_sizes.append(n)
+            offset += n
+        if offset == 0:
+            return np.zeros(1, dtype=np.float32)
+
+        volume = min(max(float(self.config.volume), 0.0), 1.0)
+        attack_env, release_env = self._envelopes()
+        attack_samples = attack_env.size
+        release_samples = release_env.size
 
-            t = np.arange(n, dtype=np.float32)
-            wave = np.sin(phase + phase_step * t, dtype=np.float32)
-            phase = float((phase + phase_step * n) % (2.0 * np.pi))
-
-            env = np.ones(n, dtype=np.float32)
-            a = min(attack_samples, n)
-            r = min(release_samples, n)
-            if a > 0:
-                env[:a] = np.linspace(0.0, 1.0, a, endpoint=False, dtype=np.float32)
-            if r > 0:
-                env[-r:] *= np.linspace(1.0, 0.0, r, endpoint=False, dtype=np.float32)
-            if a + r > n and n > 1:
-                mid = n // 2
-                env[:mid] = np.linspace(0.0, 1.0, mid, endpoint=False, dtype=np.float32)
-                env[mid:] = np.linspace(1.0, 0.0, n - mid, endpoint=False, dtype=np.float32)
-
-            chunks.append((wave * env * volume).astype(np.float32))
-
-        audio = np.concatenate(chunks, dtype=np.float32)
         # tail silence for decoder flush / playback comfort
-        tail = np.zeros(max(int(0.3 * sr), 1), dtype=np.float32)
-        return np.concatenate([audio, tail], dtype=np.float32)
+        tail = max(int(0.3 * sr), 1)
+        audio = np.zeros(offset + tail, dtype=np.float32)
+        table = self._update_sine_table()
+        step = self._phase_step
+        modulus = self._phase_modulus
+        shift = self._phase_shift
+        phase = 0
+
+        for offset, n in zip(on_starts, on_sizes):
+            seg = audio[offset : offset + n]
+            acc = np.arange(n, dtype=np.int64)
+            acc *= step
+            acc += phase
+            acc %= modulus
+            acc >>= shift
+            np.take(table, acc, out=seg)
+            phase = (phase + step * n) % modulus
+
+            if n >= attack_samples + release_samples:
+                seg[:attack_samples] *= attack_env
+                seg[n - release_samples :] *= release_env
+            else:
+                up, down = self._short_pulse_ramps(n)
+                seg[: up.size] *= up
+                seg[up.size :] *= down
+            seg *= volume
+
+        return audio
+
+    def _envelopes(self) -> Tuple[np.ndarray, np.ndarray]:
+        sr = self.config.sample_rate
+        key = (sr, self.config.attack_ms, self.config.release_ms)
+        if key != self._envelope_key:
+            attack_samples = max(int(sr * self.config.attack_ms / 1000.0), 0)
+            release_samples = max(int(sr * self.config.release_ms / 1000.0), 0)
+            self._attack_env = np.linspace(0.0, 1.0, attack_samples, endpoint=False, dtype=np.float32)
+            self._release_env = np.linspace(1.0, 0.0, release_samples, endpoint=False, dtype=np.float32)
+            self._short_ramps.clear()
+            self._envelope_key = key
+        return self._attack_env, self._release_env
+
+    def _short_pulse_ramps(self, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        # Pulses shorter than attack + release split their length between the two
+        # ramps in the configured proportion; both still reach full gain and meet
+        # there. Pulse lengths repeat (dits, dahs), so the pairs are cached per n.
+        ramps = self._short_ramps.get(n)
+        if ramps is None:
+            a = n * self._attack_env.size // (self._attack_env.size + self._release_env.size)
+            up = np.linspace(0.0, 1.0, a, endpoint=False, dtype=np.float32)
+            down = np.linspace(1.0, 0.0, n - a, endpoint=False, dtype=np.float32)
+            ramps = self._short_ramps[n] = (up, down)
+        return ramps
+
+    def _update_sine_table(self) -> np.ndarray:
+        sr = self.config.sample_rate
+        tone = self.config.tone_hz
+        key = (sr, tone)
+        if key == self._sine_key:
+            return self._sine_table
+
+        period = sr / tone if tone > 0.0 else 0.0
+        period_int = int(round(period))
+        if period_int >= 2 and abs(period - period_int) < 1e-9:
+            # Whole number of samples per cycle: one exact period, phase in samples.
+            self._sine_table = np.sin(2.0 * np.pi * np.arange(period_int) / period_int).astype(np.float32)
+            self._phase_step = 1
+            self._phase_modulus = period_int
+            self._phase_shift = 0
+        else:
+            # Otherwise the shared fixed-point phase accumulator and sine table.
+            self._sine_table = SINE_TABLE
+            self._phase_modulus = PHASE_MODULUS
+            self._phase_step = phase_step(tone, sr)
+            self._phase_shift = PHASE_SHIFT
+        self._sine_key = key
+        return self._sine_table
 
     def play_text(self, text: str, device: Optional[int] = None, blocking: bool = True) -> None:
         if sd is None:
@@ -124,15 +200,3 @@ class CWEncoder:
         audio = self.encode_to_audio(text)
         sd.play(audio, samplerate=self.config.sample_rate, device=device, blocking=blocking)
 
-
-def _merge_same_state_pulses(pulses: Sequence[Pulse]) -> List[Pulse]:
-    if not pulses:
-        return []
-    merged: List[Pulse] = [pulses[0]]
-    for state, duration in pulses[1:]:
-        prev_state, prev_dur = merged[-1]
-        if prev_state == state:
-            merged[-1] = (state, prev_dur + duration)
-        else:
-            merged.append((state, duration))
-    return merged
@@ -6,9 +6,18 @@ from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 
 PatternList = Tuple[str, ...]
 
+# Report checks are the same with or without the 599 allowance; both keys share these.
+_S2_REPORT_WITH_CALL: PatternList = (r"^.*{OTHER_CALL}.*(?:[1-5][1-9N][9N]).*(?:[1-5][1-9N][9N]).*$",)
+_S2_REPORT_NO_CALL: PatternList = (r"^.*(?:[1-5][1-9N][9N]).*(?:[1-5][1-9N][9N]).*$",)
+
 
 @dataclass(frozen=True)
 class ExchangePatterns:
@@ -26,12 +35,10 @@ def default_exchange_patterns() -> ExchangePatterns:
             "SOTA": (r"^.*(?:CQ)+.*SOTA.*DE.*(?:{MY_CALL})+.*K.*$",),
         },
         s2={
-            "report_require_call": (r"^.*{OTHER_CALL}.*(?:[1-5][1-9N][9N]).*(?:[1-5][1-9N][9N]).*$",),
-            "report_require_call_allow_599": (
-                r"^.*{OTHER_CALL}.*(?:[1-5][1-9N][9N]).*(?:[1-5][1-9N][9N]).*$",
-            ),
-            "report_no_call": (r"^.*(?:[1-5][1-9N][9N]).*(?:[1-5][1-9N][9N]).*$",),
-            "report_no_call_allow_599": (r"^.*(?:[1-5][1-9N][9N]).*(?:[1-5][1-9N][9N]).*$",),
+            "report_require_call": _S2_REPORT_WITH_CALL,
+            "report_require_call_allow_599": _S2_REPORT_WITH_CALL,
+            "report_no_call": _S2_REPORT_NO_CALL,
+            "report_no_call_allow_599": _S2_REPORT_NO_CALL,
             "p2p_ack": (r"^{OTHER_CALL}$",),
         },
         s5={
@@ -83,7 +90,7 @@ def load_exchange_patterns(path: Optional[str | Path]) -> Tuple[ExchangePatterns
         return defaults, f"Pattern file not found: {p}. Using built-in defaults."
 
     try:
-        raw = yaml.safe_load(p.read_text(encoding="utf-8")) or {}
+        raw = yaml.load(p.read_text(encoding="utf-8"), Loader=_YamlLoader) or {}
     except Exception as exc:
         return defaults, f"Pattern file could not be read: {p} ({exc}). Using built-in defaults."
 
@@ -111,6 +118,9 @@ def _merge_pattern_section(
     if not isinstance(updates, Mapping):
         return merged
 
+    # Keys given identical pattern lists share one tuple (and so one compiled regex downstream).
+    shared: Dict[PatternList, PatternList] = {patterns: patterns for patterns in merged.values()}
+
     for raw_key, raw_patterns in updates.items():
         if not isinstance(raw_key, str):
             continue
@@ -119,7 +129,7 @@ def _merge_pattern_section(
             continue
         patterns = _as_pattern_list(raw_patterns)
         if patterns:
-            merged[key] = patterns
+            merged[key] = shared.setdefault(patterns, patterns)
     return merged
 
 
@@ -137,7 +147,8 @@ def _as_pattern_list(raw: Any) -> PatternList:
         text = item.strip()
         if text:
             out.append(text)
-    return tuple(out)
+    # A pattern listed twice would only be tried twice.
+    return tuple(dict.fromkeys(out))
 
 
 def _merge_template_section(
@@ -1,12 +1,23 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import numpy as np
 
+from .tone import PHASE_MASK, PHASE_SHIFT, SINE_TABLE, phase_step
 
-@dataclass
+try:
+    from numba import njit
+except Exception:  # pragma: no cover - optional accelerator
+    njit = None
+
+# Started elements are kept as 0 ('.') / 1 ('-') in a ring of this many entries.
+_STARTED_CAPACITY = 256
+_ELEMENT_CHARS = (".", "-")
+
+
+@dataclass(frozen=True)
 class IambicAKeyerConfig:
     sample_rate: int = 48000
     wpm: float = 20.0
@@ -35,7 +46,6 @@ class IambicAKeyer:
     """
 
     def __init__(self, config: IambicAKeyerConfig):
-        self.config = config
         self.dit_pressed = False
         self.dah_pressed = False
 
@@ -44,11 +54,32 @@ class IambicAKeyer:
         self._current_element: Optional[str] = None
         self._last_element_sent: Optional[str] = None
         self._iambic_active = False
-        self._tone_phase = 0.0
-        self._started_elements: List[str] = []
+        self._tone_phase = 0
+        self._started = np.zeros(_STARTED_CAPACITY, dtype=np.uint8)
+        self._started_head = 0
+        self._started_tail = 0
         self._mark_elapsed_samples = 0
         self._mark_total_samples = 0
 
+        # Output block, sample indices 0..n-1 (float and int) and work areas, grown on demand.
+        self._out_buf = np.zeros(0, dtype=np.float32)
+        self._ramp = np.zeros(0, dtype=np.float32)
+        self._counts = np.zeros(0, dtype=np.int64)
+        self._scratch = np.zeros(0, dtype=np.float32)
+        self._phase_scratch = np.zeros(0, dtype=np.int64)
+        self.reconfigure(config)
+
+    def reconfigure(self, config: IambicAKeyerConfig) -> None:
+        """Switch to a new config, precomputing everything derived from it."""
+        self.config = config
+        sr = max(int(config.sample_rate), 1)
+        self._amp = min(max(float(config.volume), 0.0), 1.0)
+        self._tone_step = phase_step(max(float(config.tone_hz), 1.0), float(sr))
+        self._attack_samples = max(int(round(sr * max(float(config.attack_ms), 0.0) / 1000.0)), 0)
+        self._release_samples = max(int(round(sr * max(float(config.release_ms), 0.0) / 1000.0)), 0)
+        self._dot_n = max(int(round(config.dot_seconds * config.sample_rate)), 1)
+        self._dash_n = 3 * self._dot_n
+
     def reset(self) -> None:
         self.dit_pressed = False
         self.dah_pressed = False
@@ -56,8 +87,8 @@ class IambicAKeyer:
         self._remaining_samples = 0
         self._current_element = None
         self._iambic_active = False
-        self._tone_phase = 0.0
-        self._started_elements.clear()
+        self._tone_phase = 0
+        self._started_head = self._started_tail = 0
         self._mark_elapsed_samples = 0
         self._mark_total_samples = 0
 
@@ -74,15 +105,50 @@ class IambicAKeyer:
         return self.render_samples(n)
 
     def render_samples(self, num_samples: int) -> np.ndarray:
+        """
+        Render the next ``num_samples`` of sidetone.
+
+        The result is a view of a buffer reused by the next call; copy it if
+        it must outlive that (the audio callback mixes it in immediately).
+        """
         if num_samples <= 0:
             return np.zeros(0, dtype=np.float32)
 
-        out = np.zeros(num_samples, dtype=np.float32)
-        amp = float(np.clip(self.config.volume, 0.0, 1.0))
-        sr = max(int(self.config.sample_rate), 1)
-        tone_hz = max(float(self.config.tone_hz), 1.0)
-        tone_step = 2.0 * np.pi * tone_hz / float(sr)
+        self._ensure_capacity(num_samples)
+        out = self._out_buf[:num_samples]
+        out.fill(0.0)
+        self._render_into(out)
+        return out
 
+    def render_block_batch(self, num_samples: int, n_blocks: int) -> np.ndarray:
+        """
+        Render ``n_blocks`` consecutive blocks as rows of a new (n_blocks, num_samples) array.
+
+        Paddle state is sampled at element boundaries only, so this equals
+        ``n_blocks`` calls to ``render_samples`` with the paddles unchanged,
+        rendered in a single Python call.
+        """
+        blocks = np.zeros((max(int(n_blocks), 0), max(int(num_samples), 0)), dtype=np.float32)
+        if blocks.size:
+            # Row by row, so the scratch buffers stay sized to one block.
+            self._ensure_capacity(blocks.shape[1])
+            for row in blocks:
+                self._render_into(row)
+        return blocks
+
+    def _ensure_capacity(self, num_samples: int) -> None:
+        if self._ramp.size >= num_samples:
+            return
+        self._out_buf = np.empty(num_samples, dtype=np.float32)
+        self._ramp = np.arange(num_samples, dtype=np.float32)
+        self._counts = np.arange(num_samples, dtype=np.int64)
+        self._scratch = np.empty(num_samples, dtype=np.float32)
+        self._phase_scratch = np.empty(num_samples, dtype=np.int64)
+
+    def _render_into(self, out: np.ndarray) -> None:
+        num_samples = out.size
+        amp = self._amp
+        tone_step = self._tone_step
         pos = 0
         while pos < num_samples:
             if self._phase == "idle":
@@ -95,11 +161,22 @@ class IambicAKeyer:
                 continue
 
             if self._phase == "mark":
-                t = np.arange(seg, dtype=np.float32)
-                wave = np.sin(self._tone_phase + tone_step * t).astype(np.float32, copy=False)
-                env = self._mark_envelope(seg)
-                out[pos : pos + seg] = wave * env * amp
-                self._tone_phase = float((self._tone_phase + tone_step * seg) % (2.0 * np.pi))
+                view = out[pos : pos + seg]
+                if _render_mark_kernel is not None:
+                    _render_mark_kernel(
+                        view,
+                        SINE_TABLE,
+                        self._tone_phase,
+                        tone_step,
+                        self._mark_elapsed_samples,
+                        self._mark_total_samples,
+                        self._attack_samples,
+                        self._release_samples,
+                        amp,
+                    )
+                else:
+                    self._render_mark(view, tone_step, amp)
+                self._tone_phase = (self._tone_phase + tone_step * seg) & PHASE_MASK
                 self._mark_elapsed_samples += seg
 
             pos += seg
@@ -107,18 +184,18 @@ class IambicAKeyer:
             if self._remaining_samples <= 0:
                 self._advance_phase()
 
-        return out
-
     def pop_started_elements(self) -> List[str]:
-        out = list(self._started_elements)
-        self._started_elements.clear()
-        return out
+        return [_ELEMENT_CHARS[code] for code in self.pop_started_elements_raw().tolist()]
 
-    def _dot_samples(self) -> int:
-        return max(int(round(self.config.dot_seconds * self.config.sample_rate)), 1)
+    def pop_started_elements_raw(self) -> np.ndarray:
+        """
+        Return elements started since the last pop as uint8 codes (0 = '.', 1 = '-').
 
-    def _dash_samples(self) -> int:
-        return max(3 * self._dot_samples(), 1)
+        Only the most recent 256 are kept if nobody pops them.
+        """
+        out = np.take(self._started, np.arange(self._started_head, self._started_tail), mode="wrap")
+        self._started_head = self._started_tail
+        return out
 
     def _start_next_element(self) -> bool:
         element = self._choose_next_element()
@@ -130,17 +207,20 @@ class IambicAKeyer:
 
         self._current_element = element
         self._phase = "mark"
-        self._remaining_samples = self._dot_samples() if element == "." else self._dash_samples()
+        self._remaining_samples = self._dot_n if element == "." else self._dash_n
         self._mark_elapsed_samples = 0
         self._mark_total_samples = self._remaining_samples
-        self._started_elements.append(element)
+        self._started[self._started_tail % _STARTED_CAPACITY] = 0 if element == "." else 1
+        self._started_tail += 1
+        if self._started_tail - self._started_head > _STARTED_CAPACITY:
+            self._started_head = self._started_tail - _STARTED_CAPACITY
         return True
 
     def _advance_phase(self) -> None:
         if self._phase == "mark":
             self._last_element_sent = self._current_element
             self._phase = "space"
-            self._remaining_samples = self._dot_samples()
+            self._remaining_samples = self._dot_n
             self._mark_elapsed_samples = 0
             self._mark_total_samples = 0
             return
@@ -150,43 +230,98 @@ class IambicAKeyer:
             self._current_element = None
 
     def _choose_next_element(self) -> Optional[str]:
-        dit = self.dit_pressed
-        dah = self.dah_pressed
-
-        if dit and not dah:
-            self._iambic_active = False
-            return "."
-        if dah and not dit:
-            self._iambic_active = False
-            return "-"
-        if dit and dah:
-            if not self._iambic_active:
-                self._iambic_active = True
-                if self._last_element_sent in (".", "-"):
-                    return self._last_element_sent
-                return "."
-            if self._last_element_sent == ".":
-                return "-"
-            if self._last_element_sent == "-":
-                return "."
-            return "."
-
-        self._iambic_active = False
-        return None
-
-    def _mark_envelope(self, seg: int) -> np.ndarray:
-        n = max(int(seg), 1)
-        env = np.ones(n, dtype=np.float32)
-        sr = max(int(self.config.sample_rate), 1)
-        attack_samples = max(int(round(sr * max(float(self.config.attack_ms), 0.0) / 1000.0)), 0)
-        release_samples = max(int(round(sr * max(float(self.config.release_ms), 0.0) / 1000.0)), 0)
-        if attack_samples <= 0 and release_samples <= 0:
-            return env
-
-        idx = np.arange(n, dtype=np.float32) + float(self._mark_elapsed_samples)
-        if attack_samples > 0:
-            env *= np.clip((idx + 1.0) / float(attack_samples), 0.0, 1.0)
-        if release_samples > 0 and self._mark_total_samples > 0:
-            rem = float(self._mark_total_samples) - idx
-            env *= np.clip(rem / float(release_samples), 0.0, 1.0)
-        return env
+        idx = (
+            (self.dit_pressed << 4)
+            | (self.dah_pressed << 3)
+            | (self._iambic_active << 2)
+            | _LAST_ELEMENT_INDEX[self._last_element_sent]
+        )
+        element, self._iambic_active = _NEXT_ELEMENT_TABLE[idx]
+        return element
+
+    def _render_mark(self, view: np.ndarray, tone_step: int, amp: float) -> None:
+        # 32-bit fixed-point phase accumulator; its top bits index the sine table.
+        acc = self._phase_scratch[: view.size]
+        np.multiply(self._counts[: view.size], tone_step, out=acc)
+        acc += self._tone_phase
+        acc &= PHASE_MASK
+        acc >>= PHASE_SHIFT
+        np.take(SINE_TABLE, acc, out=view)
+        # Steady-state middle of a mark: both ramps are out of reach, so the
+        # envelope is unit gain and only the amplitude needs applying.
+        elapsed = self._mark_elapsed_samples
+        if elapsed < self._attack_samples or (
+            self._mark_total_samples - elapsed - view.size < self._release_samples
+        ):
+            self._apply_mark_envelope(view)
+        view *= amp
+
+    def _apply_mark_envelope(self, view: np.ndarray) -> None:
+        # Only the samples still inside the attack or release ramp are scaled;
+        # the rest of the mark has unit gain.
+        seg = view.size
+        elapsed = self._mark_elapsed_samples
+        attack_samples = self._attack_samples
+        if attack_samples > 0 and elapsed < attack_samples:
+            k = min(seg, attack_samples - elapsed)
+            gain = self._scratch[:k]
+            np.add(self._ramp[:k], float(elapsed + 1), out=gain)
+            gain *= 1.0 / float(attack_samples)
+            view[:k] *= gain
+
+        release_samples = self._release_samples
+        total = self._mark_total_samples
+        if release_samples > 0 and total > 0:
+            j = max(total - release_samples - elapsed, 0)
+            if j < seg:
+                gain = self._scratch[: seg - j]
+                np.subtract(float(total - elapsed), self._ramp[j:seg], out=gain)
+                gain *= 1.0 / float(release_samples)
+                view[j:] *= gain
+
+
+if njit is not None:
+
+    @njit(cache=True, fastmath=True)
+    def _render_mark_kernel(out, table, phase, step, elapsed, total, attack, release, amp):  # pragma: no cover
+        # Same tone and envelope as IambicAKeyer._render_mark, in one pass per sample.
+        for i in range(out.size):
+            idx = elapsed + i
+            gain = amp
+            if attack > 0 and idx < attack:
+                gain *= (idx + 1) / attack
+            if release > 0 and total > 0 and total - idx < release:
+                gain *= (total - idx) / release
+            out[i] = table[((phase + step * i) & PHASE_MASK) >> PHASE_SHIFT] * gain
+
+    # Pay the JIT compilation cost at import time rather than in the first audio callback.
+    _render_mark_kernel(np.zeros(16, dtype=np.float32), SINE_TABLE, 0, 1, 0, 16, 4, 4, 1.0)
+else:
+    _render_mark_kernel = None
+
+
+def _next_element_rule(
+    dit: bool,
+    dah: bool,
+    iambic_active: bool,
+    last: Optional[str],
+) -> Tuple[Optional[str], bool]:
+    """Mode A decision: (element to send next, iambic squeeze active afterwards)."""
+    if dit and not dah:
+        return ".", False
+    if dah and not dit:
+        return "-", False
+    if dit and dah:
+        if not iambic_active:
+            return (last if last in (".", "-") else "."), True
+        return ("-" if last == "." else "."), True
+    return None, False
+
+
+# Every input combination resolved up front, indexed by
+# dit << 4 | dah << 3 | iambic_active << 2 | last-element index.
+_LAST_ELEMENT_INDEX = {None: 0, ".": 1, "-": 2}
+_NEXT_ELEMENT_TABLE: Tuple[Tuple[Optional[str], bool], ...] = tuple(
+    _next_element_rule(bool(i & 16), bool(i & 8), bool(i & 4), (None, ".", "-", None)[i & 3])
+    for i in range(32)
+)
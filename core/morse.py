@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import re
-from typing import Iterable, Iterator, List
+from typing import Iterable, Iterator, List, Tuple
 
 # ITU Morse (subset plus punctuation needed by this project)
 MORSE_CODE = {
@@ -56,23 +56,47 @@ PROSIGN_TOKEN = "<CAVE>"
 MORSE_DECODE = {v: k for k, v in MORSE_CODE.items()}
 MORSE_DECODE[PROSIGN_CAVE_PATTERN] = PROSIGN_TOKEN
 
+# Packed form of an empty pattern: elements are appended as bits (dot=0,
+# dash=1) under a leading 1, so patterns of different lengths never collide.
+EMPTY_PACKED_PATTERN = 1
+
+
+def pack_morse_pattern(pattern: str) -> int:
+    code = EMPTY_PACKED_PATTERN
+    for element in pattern:
+        code = (code << 1) | (element == "-")
+    return code
+
+
+# MORSE_DECODE keyed by packed pattern, for decoders that accumulate elements as bits.
+MORSE_DECODE_PACKED = {pack_morse_pattern(k): v for k, v in MORSE_DECODE.items()}
+
+# MORSE_CODE packed the same way and indexed by ord(ch) over the ASCII range;
+# 0 means the character has no code.
+MORSE_PACKED: Tuple[int, ...] = tuple(
+    pack_morse_pattern(MORSE_CODE[chr(i)]) if chr(i) in MORSE_CODE else 0 for i in range(128)
+)
+
 TOKEN_RE = re.compile(r"<[A-Z0-9]+>|[A-Z0-9/?=.,-]+")
+_TOKEN_FINDALL = TOKEN_RE.findall
+_SPACE_JOIN = " ".join
 
 
 def normalize_text(text: str) -> str:
-    return " ".join(text.strip().upper().split())
+    # split() with no argument already drops leading/trailing whitespace.
+    return _SPACE_JOIN(text.upper().split())
 
 
 def tokenize_text(text: str) -> List[str]:
-    return TOKEN_RE.findall(normalize_text(text))
+    # Tokens never contain whitespace, so collapsing it first (normalize_text) is not needed.
+    return _TOKEN_FINDALL(text.upper())
 
 
 def iter_token_chars(token: str) -> Iterator[str]:
+    # A plain str iterator rather than a generator: no frame to resume per character.
     if token.startswith("<") and token.endswith(">") and len(token) > 2:
-        yield from token[1:-1]
-        return
-    for ch in token:
-        yield ch
+        return iter(token[1:-1])
+    return iter(token)
 
 
 def token_to_morse_letters(token: str) -> List[str]:
@@ -89,10 +113,4 @@ def collapse_cave_tokens(tokens: Iterable[str]) -> List[str]:
     Convert 'CAVE' literals into prosign token in text-level flows.
     This does not try to infer timing; timing-based decode happens in decoder.
     """
-    out: List[str] = []
-    for tok in tokens:
-        if tok == "CAVE":
-            out.append(PROSIGN_TOKEN)
-        else:
-            out.append(tok)
-    return out
+    return [PROSIGN_TOKEN if tok == "CAVE" else tok for tok in tokens]
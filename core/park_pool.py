@@ -2,31 +2,50 @@ from __future__ import annotations
 
 import csv
 from pathlib import Path
-from typing import List, Sequence
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Parsed park files keyed by path, tagged with the (mtime_ns, size) they were read at.
+_PARK_CACHE: Dict[Path, Tuple[Tuple[int, int], List[str]]] = {}
 
 
 def parse_active_park_refs_csv_lines(lines: Sequence[str]) -> List[str]:
-    text = "\n".join(lines)
-    return parse_active_park_refs_csv_text(text)
+    return _parse_active_park_refs(lines)
 
 
 def parse_active_park_refs_csv_text(text: str) -> List[str]:
+    return _parse_active_park_refs(text.splitlines())
+
+
+def load_active_park_refs_file(path: str | Path) -> List[str]:
+    p = Path(path)
+    st = p.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _PARK_CACHE.get(p)
+    if cached is not None and cached[0] == stamp:
+        return list(cached[1])
+    data = p.read_text(encoding="utf-8", errors="ignore")
+    refs = parse_active_park_refs_csv_text(data)
+    _PARK_CACHE[p] = (stamp, refs)
+    return list(refs)
+
+
+def _parse_active_park_refs(lines: Iterable[str]) -> List[str]:
     refs: List[str] = []
     seen = set()
-    reader = csv.DictReader(text.splitlines())
+    seen_add = seen.add
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None or "reference" not in header or "active" not in header:
+        return refs
+    ref_i = header.index("reference")
+    act_i = header.index("active")
+    min_len = max(ref_i, act_i) + 1
     for row in reader:
-        reference = str(row.get("reference", "")).strip().upper()
-        active = str(row.get("active", "")).strip()
-        if not reference or reference in seen:
+        if len(row) < min_len or row[act_i].strip() != "1":
             continue
-        if active != "1":
+        reference = row[ref_i].strip().upper()
+        if not reference or reference in seen:
             continue
-        seen.add(reference)
+        seen_add(reference)
         refs.append(reference)
     return refs
-
-
-def load_active_park_refs_file(path: str | Path) -> List[str]:
-    p = Path(path)
-    data = p.read_text(encoding="utf-8", errors="ignore")
-    return parse_active_park_refs_csv_text(data)
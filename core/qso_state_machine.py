@@ -2,15 +2,49 @@ from __future__ import annotations
 
 import random
 import re
-from dataclasses import asdict, dataclass, field
-from datetime import datetime, timezone
+import time
+from collections import deque
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+from functools import lru_cache
+from typing import Deque, Dict, FrozenSet, Iterable, List, Mapping, Optional, Pattern, Sequence, Set, Tuple
 
 from .exchange_patterns import ExchangePatterns, load_exchange_patterns
-from .morse import PROSIGN_TOKEN, collapse_cave_tokens, tokenize_text
-
-_S2_REPORT_RE = re.compile(r"[1-5][1-9N][9N]")
+from .morse import PROSIGN_TOKEN, tokenize_text
+
+_S2_REPORT = r"[1-5][1-9N][9N]"
+# Two non-overlapping reports anywhere in the compact text. Reports are fixed
+# width, so this matches exactly when findall would count at least two.
+_S2_TWO_REPORTS_RE = re.compile(rf"{_S2_REPORT}.*{_S2_REPORT}")
+_BACKREF_RE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+_PLACEHOLDER_RE = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
+_ALNUM_RE = re.compile(r"[A-Za-z0-9]")
+_CAVE_FORMS = frozenset(("CAVE", PROSIGN_TOKEN))
+_MULTI_SPACE_RE = re.compile(r" {2,}")
+_TOKEN_SEP = "\x1f"
+_DOUBLE_E_RE = re.compile(r"(?:^|(?<=\x1f))E\x1fE(?=\x1f|$)")
+_MAX_LOG_ENTRIES = 2000
+_EMPTY_PATTERNS: Tuple[str, ...] = ()
+# Exchange-pattern keys indexed by their flag bits, so handlers pick a key
+# without concatenating strings on every RX.
+_S2_REPORT_KEYS = (  # (require_call << 1) | allow_599
+    "report_no_call",
+    "report_no_call_allow_599",
+    "report_require_call",
+    "report_require_call_allow_599",
+)
+_S5_KEYS = (  # (p2p << 2) | (use_prosigns << 1) | allow_tu
+    "without_prosign",
+    "without_prosign_allow_tu",
+    "with_prosign",
+    "with_prosign_allow_tu",
+    "p2p_without_prosign",
+    "p2p_without_prosign_allow_tu",
+    "p2p_with_prosign",
+    "p2p_with_prosign_allow_tu",
+)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
 
 
 class QSOState(str, Enum):
@@ -22,7 +56,7 @@ class QSOState(str, Enum):
     S6_REPLY_EE = "S6_REPLY_EE"
 
 
-@dataclass
+@dataclass(slots=True)
 class QSOConfig:
     my_call: str = "EA4XYZ"
     other_call: str = "N1MM"
@@ -44,7 +78,7 @@ class QSOConfig:
     ignore_fill_tokens: Tuple[str, ...] = ("RR", "R", "DE")
 
 
-@dataclass
+@dataclass(slots=True)
 class QSOResult:
     state: QSOState
     accepted: bool
@@ -53,7 +87,7 @@ class QSOResult:
     info: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class QSOCompletion:
     timestamp_utc: str
     my_call: str
@@ -69,28 +103,47 @@ class QSOStateMachine:
         self.rx_transcript: List[str] = []
         self.tx_transcript: List[str] = []
         self.completions: List[QSOCompletion] = []
-        self.logs: List[Dict[str, str]] = []
-        self._other_call_pool: List[str] = []
+        # Export form of each completion, built once when the QSO completes.
+        self._completion_dicts: List[Dict[str, object]] = []
+        # (timestamp_ns, level, state, message) records; see _export_log_entry.
+        self.logs: Deque[Tuple[int, str, str, str]] = deque(maxlen=_MAX_LOG_ENTRIES)
+        self._other_call_pool: Tuple[str, ...] = ()
         self._park_ref_pool: List[str] = []
         self._active_other_call_real = self.config.other_call.upper()
         self._active_other_call = self.config.other_call.upper()
         self._s2_rr_confirmed = False
-        self._pending_callers: List[str] = []
+        # Insertion-ordered set: callers keep their order and selection removes in O(1).
+        self._pending_callers: Dict[str, None] = {}
         self._pending_p2p_real_call: Optional[str] = None
         self._active_call_selected = False
         self._active_is_p2p = False
         self._active_p2p_park_ref: Optional[str] = None
+        self._rx_tokens: Optional[List[str]] = None
+        self._rx_compact_tokens: List[str] = []
+        self._rx_compact = ""
+        self._config_cache_key: Optional[Tuple[object, ...]] = None
+        self._values_cache: Dict[Tuple[object, ...], Dict[str, str]] = {}
+        self._prosign_rx_token = ""
+        self._prosign_tx_token = ""
+        self._my_call_upper = ""
+        self._other_call_upper = ""
+        self._my_park_upper = ""
+        self._my_park_compact = ""
+        self._fill_tokens: FrozenSet[str] = frozenset()
+        self._fill_tokens_with_bk: FrozenSet[str] = frozenset()
+        self._refresh_config_cache()
         self._exchange_patterns: ExchangePatterns
         self._exchange_patterns, pattern_error = load_exchange_patterns(self.config.exchange_patterns_file)
         if pattern_error:
             self._log("WARN", pattern_error, self.state)
 
     def reset(self) -> None:
+        self._refresh_config_cache()
         self.state = QSOState.S0_IDLE
         self.rx_transcript.clear()
         self.tx_transcript.clear()
-        self._active_other_call_real = self.config.other_call.upper()
-        self._active_other_call = self.config.other_call.upper()
+        self._active_other_call_real = self._other_call_upper
+        self._active_other_call = self._other_call_upper
         self._s2_rr_confirmed = False
         self._pending_callers.clear()
         self._pending_p2p_real_call = None
@@ -100,15 +153,9 @@ class QSOStateMachine:
         self._log("INFO", "QSO reset manual", self.state)
 
     def set_other_call_pool(self, calls: Sequence[str], source_file: Optional[str] = None) -> None:
-        cleaned: List[str] = []
-        seen = set()
-        for call in calls:
-            c = call.strip().upper()
-            if not c or c in seen:
-                continue
-            seen.add(c)
-            cleaned.append(c)
-        self._other_call_pool = cleaned
+        # Stripped, upper-cased and deduplicated once here, in first-seen order.
+        cleaned = dict.fromkeys(c for c in (call.strip().upper() for call in calls) if c)
+        self._other_call_pool = tuple(cleaned)
         if self._pending_p2p_real_call and self._pending_p2p_real_call not in cleaned:
             self._pending_p2p_real_call = None
         if source_file is not None:
@@ -152,14 +199,19 @@ class QSOStateMachine:
         return len(self._park_ref_pool)
 
     def process_text(self, text: str) -> QSOResult:
+        self._refresh_config_cache()
         tokens = self._normalize_tokens(text)
         result = QSOResult(state=self.state, accepted=False)
         if not tokens:
             result.errors.append("No se detectaron tokens utiles.")
             return result
 
-        self.rx_transcript.append(" ".join(tokens))
-        self._log("RX", " ".join(tokens), self.state)
+        joined = " ".join(tokens)
+        self.rx_transcript.append(joined)
+        self._log("RX", joined, self.state)
+        self._rx_tokens = tokens
+        self._rx_compact_tokens = _compact_tokens(tokens)
+        self._rx_compact = "".join(self._rx_compact_tokens)
 
         if self.state == QSOState.S0_IDLE:
             return self._handle_s0(tokens)
@@ -174,7 +226,8 @@ class QSOStateMachine:
     def export_session(self) -> Dict[str, object]:
         return {
             "state": self.state.value,
-            "config": asdict(self.config),
+            # QSOConfig is flat, so a field-by-field copy replaces asdict's deep copy.
+            "config": {f.name: getattr(self.config, f.name) for f in fields(self.config)},
             "active_other_call": self._active_other_call,
             "active_other_call_real": self._active_other_call_real,
             "active_is_p2p": self._active_is_p2p,
@@ -183,8 +236,8 @@ class QSOStateMachine:
             "pending_p2p_real_call": self._pending_p2p_real_call,
             "active_call_selected": self._active_call_selected,
             "park_ref_pool_size": len(self._park_ref_pool),
-            "logs": self.logs,
-            "completions": [asdict(c) for c in self.completions],
+            "logs": [_export_log_entry(entry) for entry in self.logs],
+            "completions": list(self._completion_dicts),
             "rx_transcript": self.rx_transcript,
             "tx_transcript": self.tx_transcript,
         }
@@ -196,44 +249,39 @@ class QSOStateMachine:
         required: List[str] = ["CQ"]
         if cq_mode in ("POTA", "SOTA"):
             required.append(cq_mode)
-        required.extend(["DE", self.config.my_call.upper(), "K"])
+        required.extend(["DE", self._my_call_upper, "K"])
         missing = ""
-        patterns = self._exchange_patterns.s0.get(cq_mode, tuple())
+        patterns = self._exchange_patterns.s0.get(cq_mode, _EMPTY_PATTERNS)
         if patterns:
             ok = self._match_compact_exchange_patterns(patterns, tokens)
-            _, missing = _contains_subsequence_flexible(tokens, required)
+            _, missing = _contains_subsequence_flexible(self._compact_join(tokens), required)
         else:
-            ok, missing = _contains_subsequence_flexible(tokens, required)
+            ok, missing = _contains_subsequence_flexible(self._compact_join(tokens), required)
 
-        result = QSOResult(state=self.state, accepted=ok)
         if not ok:
             if missing:
-                result.errors.append(f"S0 invalido: falto o no coincide token '{missing}'.")
-            else:
-                result.errors.append(f"S0 invalido: no coincide con patron de CQ para modo '{cq_mode}'.")
-            self._log("ERR", result.errors[-1], self.state)
-            return result
+                return self._reject(f"S0 invalido: falto o no coincide token '{missing}'.")
+            return self._reject(f"S0 invalido: no coincide con patron de CQ para modo '{cq_mode}'.")
 
         self._s2_rr_confirmed = False
         self._active_call_selected = False
-        self._pending_callers = self._draw_new_incoming_callers()
+        self._pending_callers = dict.fromkeys(self._draw_new_incoming_callers())
         replies = self._emit_callers(self._pending_callers)
-
-        result.state = self.state
-        result.accepted = True
-        result.replies = replies
-        result.info = [f"CQ valido, {len(replies)} estaciones llamando. Selecciona una por indicativo exacto."]
-        return result
+        return QSOResult(
+            state=self.state,
+            accepted=True,
+            replies=replies,
+            info=[f"CQ valido, {len(replies)} estaciones llamando. Selecciona una por indicativo exacto."],
+        )
 
     def _handle_s2(self, tokens: Sequence[str]) -> QSOResult:
         if not self._active_call_selected:
             return self._handle_s2_select_station(tokens)
 
         call = self._active_other_call
-        if _is_full_call_query(tokens, call):
+        if _is_full_call_query(self._compact_tokens(tokens), call):
             reply = self._build_tx_from_template("ack_rr", fallback="RR")
-            self.tx_transcript.append(reply)
-            self._log("TX", reply, self.state)
+            self._record_tx(reply)
             self._s2_rr_confirmed = True
             return QSOResult(
                 state=self.state,
@@ -242,15 +290,14 @@ class QSOStateMachine:
                 info=["RR enviado; continua con el reporte."],
             )
 
-        if _is_repeat_request_for_call(tokens, call):
+        if self._is_repeat_request(tokens):
             reply = self._build_tx_from_template(
                 "repeat_selected_call",
                 fallback=f"{call} {call}",
                 other_call=call,
                 extra_values={"CALL": call},
             )
-            self.tx_transcript.append(reply)
-            self._log("TX", reply, self.state)
+            self._record_tx(reply)
             return QSOResult(
                 state=self.state,
                 accepted=True,
@@ -263,19 +310,16 @@ class QSOStateMachine:
     def _handle_s2_select_station(self, tokens: Sequence[str]) -> QSOResult:
         if not self._pending_callers:
             msg = "S2 invalido: no hay estaciones pendientes para seleccionar."
-            self._log("ERR", msg, self.state)
-            return QSOResult(state=self.state, accepted=False, errors=[msg])
+            return self._reject(msg)
 
         # Exact full query (e.g. EA3IMR?) selects only that station and replies RR.
-        selected_query = next(
-            (c for c in self._pending_callers if _is_full_call_query(tokens, self._display_call(c))),
-            None,
-        )
+        compact = self._compact_tokens(tokens)
+        queried = _full_call_queries(compact)
+        selected_query = next((c for c in self._pending_callers if self._display_call(c) in queried), None)
         if selected_query:
             self._select_pending_station(selected_query)
             reply = self._build_tx_from_template("ack_rr", fallback="RR")
-            self.tx_transcript.append(reply)
-            self._log("TX", reply, self.state)
+            self._record_tx(reply)
             self._s2_rr_confirmed = True
             return QSOResult(
                 state=self.state,
@@ -284,7 +328,7 @@ class QSOStateMachine:
                 info=[f"Estacion {self._active_other_call} seleccionada. RR enviado."],
             )
 
-        wildcard_patterns = _extract_wildcard_patterns(tokens)
+        wildcard_patterns = _extract_wildcard_patterns(compact)
         if wildcard_patterns:
             matches = self._match_pending_by_patterns(wildcard_patterns)
             if not matches:
@@ -308,20 +352,18 @@ class QSOStateMachine:
             return self._handle_s2_direct_report(tokens)
 
         msg = "S2 invalido: indica un indicativo exacto de una estacion en cola."
-        self._log("ERR", msg, self.state)
-        return QSOResult(state=self.state, accepted=False, errors=[msg])
+        return self._reject(msg)
 
     def _handle_s2_direct_report(self, tokens: Sequence[str]) -> QSOResult:
         call = self._active_other_call
-        if _is_repeat_request_for_call(tokens, call):
+        if self._is_repeat_request(tokens):
             reply = self._build_tx_from_template(
                 "repeat_selected_call",
                 fallback=f"{call} {call}",
                 other_call=call,
                 extra_values={"CALL": call},
             )
-            self.tx_transcript.append(reply)
-            self._log("TX", reply, self.state)
+            self._record_tx(reply)
             return QSOResult(
                 state=self.state,
                 accepted=True,
@@ -329,30 +371,21 @@ class QSOStateMachine:
                 info=["Solicitud de repeticion detectada; repito indicativo y sigo en S2."],
             )
 
-        cleaned = _strip_fillers(
-            tokens,
-            ignore_bk=self.config.ignore_bk,
-            ignore_tokens=self.config.ignore_fill_tokens,
-        )
+        cleaned = _strip_fillers(tokens, self._fillers(ignore_bk=self.config.ignore_bk))
         if self._active_is_p2p:
-            p2p_patterns = self._exchange_patterns.s2.get("p2p_ack", tuple())
+            p2p_patterns = self._exchange_patterns.s2.get("p2p_ack", _EMPTY_PATTERNS)
             if p2p_patterns:
                 if not self._match_compact_exchange_patterns(p2p_patterns, cleaned, other_call="P2P"):
                     msg = "S2 invalido: para P2P debes contestar con 'P2P'."
-                    result = QSOResult(state=self.state, accepted=False, errors=[msg])
-                    self._log("ERR", msg, self.state)
-                    return result
-            elif _count_token_flexible(cleaned, "P2P") < 1:
+                    return self._reject(msg)
+            elif not _contains_token_flexible(self._compact_join(cleaned), "P2P"):
                 msg = "S2 invalido: para P2P debes contestar con 'P2P'."
-                result = QSOResult(state=self.state, accepted=False, errors=[msg])
-                self._log("ERR", msg, self.state)
-                return result
+                return self._reject(msg)
 
             reply = self._build_p2p_station_reply()
             self.state = QSOState.S4_REPLY_OTHER
             self._s2_rr_confirmed = False
-            self.tx_transcript.append(reply)
-            self._log("TX", reply, self.state)
+            self._record_tx(reply)
             self.state = QSOState.S5_WAIT_FINAL
             return QSOResult(
                 state=self.state,
@@ -363,26 +396,20 @@ class QSOStateMachine:
 
         # Once a station is selected, report may omit the call.
         require_call = (not self._active_call_selected) and (not self._s2_rr_confirmed)
-        pattern_key = "report_require_call" if require_call else "report_no_call"
-        if self.config.allow_599:
-            pattern_key += "_allow_599"
-        patterns = self._exchange_patterns.s2.get(pattern_key, tuple())
+        pattern_key = _S2_REPORT_KEYS[(require_call << 1) | bool(self.config.allow_599)]
+        patterns = self._exchange_patterns.s2.get(pattern_key, _EMPTY_PATTERNS)
         if patterns:
             if not self._match_compact_exchange_patterns(patterns, cleaned, other_call=call):
                 missing = self._legacy_s2_missing_tokens(cleaned, call=call, require_call=require_call)
                 msg = f"S2 invalido: no coincide con patron '{pattern_key}'."
                 if missing:
                     msg += " Faltan: " + ", ".join(missing)
-                result = QSOResult(state=self.state, accepted=False, errors=[msg])
-                self._log("ERR", msg, self.state)
-                return result
+                return self._reject(msg)
         else:
             missing = self._legacy_s2_missing_tokens(cleaned, call=call, require_call=require_call)
             if missing:
                 msg = "S2 invalido: faltan tokens obligatorios: " + ", ".join(missing)
-                result = QSOResult(state=self.state, accepted=False, errors=[msg])
-                self._log("ERR", msg, self.state)
-                return result
+                return self._reject(msg)
 
         tx_prosign = self._tx_closing_prosign()
         # In direct mode, report reply starts with prosign and omits my callsign.
@@ -392,8 +419,7 @@ class QSOStateMachine:
         )
         self.state = QSOState.S4_REPLY_OTHER
         self._s2_rr_confirmed = False
-        self.tx_transcript.append(reply)
-        self._log("TX", reply, self.state)
+        self._record_tx(reply)
         self.state = QSOState.S5_WAIT_FINAL
         return QSOResult(
             state=self.state,
@@ -408,15 +434,12 @@ class QSOStateMachine:
             if p2p_query is not None:
                 return p2p_query
 
-        if _is_repeat_request_for_call(tokens, self._active_other_call):
+        if self._is_repeat_request(tokens):
             if not self.tx_transcript:
                 msg = "S5 invalido: no hay transmision previa para repetir."
-                result = QSOResult(state=self.state, accepted=False, errors=[msg])
-                self._log("ERR", msg, self.state)
-                return result
+                return self._reject(msg)
             reply = self.tx_transcript[-1]
-            self.tx_transcript.append(reply)
-            self._log("TX", reply, self.state)
+            self._record_tx(reply)
             return QSOResult(
                 state=self.state,
                 accepted=True,
@@ -426,52 +449,38 @@ class QSOStateMachine:
 
         cleaned = _strip_fillers(
             _collapse_double_e(tokens),
-            ignore_bk=self.config.ignore_bk and (not self.config.use_prosigns),
-            ignore_tokens=self.config.ignore_fill_tokens,
+            self._fillers(ignore_bk=self.config.ignore_bk and (not self.config.use_prosigns)),
         )
         if self._active_is_p2p and self._active_p2p_park_ref:
             return self._handle_s5_p2p(cleaned)
 
-        pattern_key = "with_prosign" if self.config.use_prosigns else "without_prosign"
-        if self.config.allow_tu:
-            pattern_key += "_allow_tu"
-        patterns = self._exchange_patterns.s5.get(pattern_key, tuple())
+        pattern_key = _S5_KEYS[(bool(self.config.use_prosigns) << 1) | bool(self.config.allow_tu)]
+        patterns = self._exchange_patterns.s5.get(pattern_key, _EMPTY_PATTERNS)
         if patterns:
             ok = self._match_compact_exchange_patterns(patterns, cleaned)
             if not ok:
                 msg = f"S5 invalido: no coincide con patron '{pattern_key}'."
-                result = QSOResult(state=self.state, accepted=False, errors=[msg])
-                self._log("ERR", msg, self.state)
-                return result
+                return self._reject(msg)
         else:
             prosign_token = self._prosign_token()
             if self.config.use_prosigns:
-                if _count_token_direct(cleaned, prosign_token) < 1:
+                if prosign_token not in cleaned:
                     msg = f"S5 invalido: prosign {prosign_token} debe enviarse sin separacion entre letras."
-                    result = QSOResult(state=self.state, accepted=False, errors=[msg])
-                    self._log("ERR", msg, self.state)
-                    return result
+                    return self._reject(msg)
                 required_basic = [prosign_token, "73", "EE"]
-                required_tu = [prosign_token, "TU", "73", "EE"]
             else:
                 required_basic = ["73", "EE"]
-                required_tu = ["TU", "73", "EE"]
 
-            ok_basic, missing_basic = _contains_subsequence_flexible(cleaned, required_basic)
-            ok_tu = False
-            if self.config.allow_tu:
-                ok_tu, _ = _contains_subsequence_flexible(cleaned, required_tu)
+            # The TU form only inserts TU into the basic sequence, so any close that
+            # matches it matches the basic one too; one scan decides both.
+            ok_basic, missing_basic = _contains_subsequence_flexible(self._compact_join(cleaned), required_basic)
 
-            result = QSOResult(state=self.state, accepted=ok_basic or ok_tu)
-            if not result.accepted:
+            if not ok_basic:
                 if self.config.use_prosigns:
                     expected = f"{prosign_token} 73 EE"
                 else:
                     expected = "73 EE"
-                msg = f"S5 invalido: cierre esperado '{expected}' (falto '{missing_basic}')."
-                result.errors.append(msg)
-                self._log("ERR", msg, self.state)
-                return result
+                return self._reject(f"S5 invalido: cierre esperado '{expected}' (falto '{missing_basic}').")
 
         return self._complete_qso_with_reply(
             reply=self._build_tx_from_template("qso_complete", fallback="EE"),
@@ -480,47 +489,34 @@ class QSOStateMachine:
         )
 
     def _normalize_tokens(self, text: str) -> List[str]:
-        toks = collapse_cave_tokens(tokenize_text(text))
-        out: List[str] = []
-        configured = self._prosign_token()
-        for t in toks:
-            if t == PROSIGN_TOKEN:
-                out.append(configured)
-            elif t.startswith("<") and t.endswith(">"):
-                out.append(t.upper())
-            else:
-                out.append(t.upper())
-        return out
+        # tokenize_text already upper-cases, so only the prosign needs mapping. A bare
+        # CAVE would become PROSIGN_TOKEN in collapse_cave_tokens; both map straight
+        # to the configured prosign here in one pass.
+        configured = self._prosign_rx_token
+        cave_forms = _CAVE_FORMS
+        return [configured if t in cave_forms else t for t in tokenize_text(text)]
 
     def _handle_s5_p2p(self, cleaned: Sequence[str]) -> QSOResult:
-        key = "p2p_with_prosign" if self.config.use_prosigns else "p2p_without_prosign"
-        if self.config.allow_tu:
-            key += "_allow_tu"
-        patterns = self._exchange_patterns.s5.get(key, tuple())
+        key = _S5_KEYS[4 | (bool(self.config.use_prosigns) << 1) | bool(self.config.allow_tu)]
+        patterns = self._exchange_patterns.s5.get(key, _EMPTY_PATTERNS)
         if patterns:
             ok = self._match_compact_exchange_patterns(patterns, cleaned)
             if not ok:
                 msg = f"S5 invalido: no coincide con patron P2P '{key}'."
-                result = QSOResult(state=self.state, accepted=False, errors=[msg])
-                self._log("ERR", msg, self.state)
-                return result
+                return self._reject(msg)
         else:
-            my_park = (self.config.my_park_ref or "").strip().upper()
-            if not my_park:
-                my_park = "EA-0000"
+            my_park = self._my_park_upper
             required: List[str] = []
             if self.config.use_prosigns:
                 required.append(self._prosign_token())
-            required.extend([self._active_other_call_real, self.config.my_call.upper(), "MY", "REF", my_park, my_park])
+            required.extend([self._active_other_call_real, self._my_call_upper, "MY", "REF", my_park, my_park])
             if self.config.allow_tu:
                 required.extend(["TU", "73"])
-            ok, missing = _contains_subsequence_flexible(cleaned, required)
+            ok, missing = _contains_subsequence_flexible(self._compact_join(cleaned), required)
             if not ok:
                 expected = " ".join(required)
                 msg = f"S5 invalido: cierre P2P esperado '{expected}' (falto '{missing}')."
-                result = QSOResult(state=self.state, accepted=False, errors=[msg])
-                self._log("ERR", msg, self.state)
-                return result
+                return self._reject(msg)
 
         return self._complete_qso_with_reply(
             reply=self._build_tx_from_template("qso_complete", fallback="EE"),
@@ -529,7 +525,7 @@ class QSOStateMachine:
         )
 
     def _handle_s5_p2p_query(self, tokens: Sequence[str]) -> Optional[QSOResult]:
-        query = _compact_join(tokens)
+        query = self._compact_join(tokens)
         if query == "CALL?":
             call = self._active_other_call_real
             reply = self._build_tx_from_template(
@@ -538,8 +534,7 @@ class QSOStateMachine:
                 other_call=call,
                 extra_values={"CALL": call},
             )
-            self.tx_transcript.append(reply)
-            self._log("TX", reply, self.state)
+            self._record_tx(reply)
             return QSOResult(
                 state=self.state,
                 accepted=True,
@@ -554,8 +549,7 @@ class QSOStateMachine:
                 fallback=f"{park} {park}",
                 extra_values={"PARK_REF": park},
             )
-            self.tx_transcript.append(reply)
-            self._log("TX", reply, self.state)
+            self._record_tx(reply)
             return QSOResult(
                 state=self.state,
                 accepted=True,
@@ -567,10 +561,10 @@ class QSOStateMachine:
     def _build_p2p_station_reply(self) -> str:
         key = "p2p_station_reply_with_tu" if self.config.allow_tu else "p2p_station_reply_without_tu"
         template = self._exchange_patterns.tx.get(key, "")
-        values = dict(self._exchange_pattern_values())
-        values["PARK_REF"] = _compact_park_ref(self._active_p2p_park_ref or "")
-        values["MY_PARK_REF"] = _compact_park_ref(self.config.my_park_ref or "")
         if template:
+            values = dict(self._exchange_pattern_values())
+            values["PARK_REF"] = _compact_park_ref(self._active_p2p_park_ref or "")
+            values["MY_PARK_REF"] = self._my_park_compact
             return _clean_message_spacing(_render_exchange_template(template, values))
 
         tx_prosign = self._tx_closing_prosign()
@@ -596,32 +590,76 @@ class QSOStateMachine:
             return _clean_message_spacing(fallback)
         values = dict(self._exchange_pattern_values(other_call=other_call))
         values["PARK_REF"] = _compact_park_ref(self._active_p2p_park_ref or "")
-        values["MY_PARK_REF"] = _compact_park_ref(self.config.my_park_ref or "")
+        values["MY_PARK_REF"] = self._my_park_compact
         if extra_values:
             for name, value in extra_values.items():
                 values[name] = _compact_token(value)
         return _clean_message_spacing(_render_exchange_template(template, values))
 
     def _prosign_token(self) -> str:
-        literal = "".join(ch for ch in self.config.prosign_literal.strip().upper() if ch.isalnum())
-        return f"<{literal or 'CAVE'}>"
+        return self._prosign_rx_token
 
     def _tx_closing_prosign(self) -> str:
-        literal = "".join(ch for ch in self.config.prosign_literal.strip().upper() if ch.isalnum())
-        return literal or "KN"
+        return self._prosign_tx_token
+
+    def _compact_tokens(self, tokens: Sequence[str]) -> List[str]:
+        # The raw RX tokens are compacted once in process_text; filtered copies are compacted afresh.
+        if tokens is self._rx_tokens:
+            return self._rx_compact_tokens
+        return _compact_tokens(tokens)
+
+    def _compact_join(self, tokens: Sequence[str]) -> str:
+        if tokens is self._rx_tokens:
+            return self._rx_compact
+        return _compact_join(tokens)
+
+    def _is_repeat_request(self, tokens: Sequence[str]) -> bool:
+        # Be permissive: any partial with '?' means "repeat your call".
+        # Example: "K2?" even if decoded prefix is not exact.
+        return "?" in self._compact_join(tokens)
+
+    def _fillers(self, *, ignore_bk: bool) -> FrozenSet[str]:
+        return self._fill_tokens_with_bk if ignore_bk else self._fill_tokens
+
+    def _refresh_config_cache(self) -> None:
+        # Keyed on the raw fields because the UI edits config fields in place;
+        # process_text refreshes once per RX so handlers can read the cached values.
+        cfg = self.config
+        key = (cfg.my_call, cfg.other_call, cfg.my_park_ref, cfg.prosign_literal, tuple(cfg.ignore_fill_tokens))
+        if key == self._config_cache_key:
+            return
+        literal = "".join(ch for ch in cfg.prosign_literal.strip().upper() if ch.isalnum())
+        self._prosign_rx_token = f"<{literal or 'CAVE'}>"
+        self._prosign_tx_token = literal or "KN"
+        self._my_call_upper = cfg.my_call.upper()
+        self._other_call_upper = cfg.other_call.upper()
+        self._my_park_upper = (cfg.my_park_ref or "").strip().upper() or "EA-0000"
+        self._my_park_compact = _compact_park_ref(cfg.my_park_ref or "")
+        self._fill_tokens = frozenset(cfg.ignore_fill_tokens)
+        self._fill_tokens_with_bk = self._fill_tokens | {"BK"}
+        self._config_cache_key = key
 
     def _exchange_pattern_values(self, *, other_call: Optional[str] = None) -> Mapping[str, str]:
-        my_park = (self.config.my_park_ref or "").strip().upper() or "EA-0000"
-        return {
-            "MY_CALL": _compact_token(self.config.my_call),
-            "OTHER_CALL": _compact_token(other_call or self._active_other_call),
-            "CALL": _compact_token(other_call or self._active_other_call),
-            "OTHER_CALL_REAL": _compact_token(self._active_other_call_real),
-            "PROSIGN": _compact_token(self._prosign_token()),
-            "TX_PROSIGN": _compact_token(self._tx_closing_prosign()),
-            "PARK_REF": _compact_token(self._active_p2p_park_ref or ""),
-            "MY_PARK_REF": _compact_token(my_park),
-        }
+        # Keyed on every input, so QSO state changes need no explicit invalidation.
+        # Callers copy before adding their own values.
+        call = other_call or self._active_other_call
+        key = (call, self._active_other_call_real, self._active_p2p_park_ref, self._config_cache_key)
+        values = self._values_cache.get(key)
+        if values is None:
+            if len(self._values_cache) >= 64:
+                self._values_cache.clear()
+            values = {
+                "MY_CALL": _compact_token(self.config.my_call),
+                "OTHER_CALL": _compact_token(call),
+                "CALL": _compact_token(call),
+                "OTHER_CALL_REAL": _compact_token(self._active_other_call_real),
+                "PROSIGN": _compact_token(self._prosign_token()),
+                "TX_PROSIGN": _compact_token(self._tx_closing_prosign()),
+                "PARK_REF": _compact_token(self._active_p2p_park_ref or ""),
+                "MY_PARK_REF": _compact_token(self._my_park_upper),
+            }
+            self._values_cache[key] = values
+        return values
 
     def _match_compact_exchange_patterns(
         self,
@@ -630,57 +668,66 @@ class QSOStateMachine:
         *,
         other_call: Optional[str] = None,
     ) -> bool:
-        compact = _compact_join(tokens)
-        values = self._exchange_pattern_values(other_call=other_call)
+        if not patterns:
+            return False
+        compact = self._compact_join(tokens)
+        values = tuple(self._exchange_pattern_values(other_call=other_call).items())
+        try:
+            return _compile_exchange_union(tuple(patterns), values).fullmatch(compact) is not None
+        except re.error:
+            pass  # Check one by one below so the offending pattern gets logged.
         for raw_pattern in patterns:
-            rendered = _render_exchange_pattern(raw_pattern, values)
             try:
-                if re.fullmatch(rendered, compact):
+                if _compile_exchange_pattern(raw_pattern, values).fullmatch(compact):
                     return True
             except re.error:
                 self._log("WARN", f"Regex invalida en patron de intercambio: {raw_pattern}", self.state)
         return False
 
     def _legacy_s2_missing_tokens(self, tokens: Sequence[str], *, call: str, require_call: bool) -> List[str]:
+        # Any whole token is also a substring of the compact join, so one
+        # string covers both the direct and the compact checks.
+        hay = self._compact_join(tokens)
         missing: List[str] = []
-        if require_call and _count_token_flexible(tokens, call) < 1:
-            missing.append(call)
-        report_count = _count_valid_s2_reports(tokens)
-        if report_count < 2:
+        if require_call:
+            needle = _compact_token(call)
+            if not needle or needle not in hay:
+                missing.append(call)
+        if _S2_TWO_REPORTS_RE.search(hay) is None:
             missing.append("RST RST")
         return missing
 
+    def _reject(self, msg: str) -> QSOResult:
+        self._log("ERR", msg, self.state)
+        return QSOResult(state=self.state, accepted=False, errors=[msg])
+
+    def _record_tx(self, reply: str) -> None:
+        self.tx_transcript.append(reply)
+        self._log("TX", reply, self.state)
+
     def _log(self, level: str, message: str, state: QSOState) -> None:
-        self.logs.append(
-            {
-                "timestamp_utc": datetime.now(timezone.utc).isoformat(),
-                "level": level,
-                "state": state.value,
-                "message": message,
-            }
-        )
-        if len(self.logs) > 2000:
-            self.logs = self.logs[-1000:]
+        # Raw clock in a plain tuple; the ISO timestamp and dict are built on export.
+        self.logs.append((time.time_ns(), level, state.value, message))
 
     def _complete_qso_with_reply(self, reply: str, interim_state: QSOState, info: str) -> QSOResult:
         completed_call = self._formatted_completion_other_call()
         self.state = interim_state
-        self.tx_transcript.append(reply)
-        self._log("TX", reply, self.state)
+        self._record_tx(reply)
 
         completion = QSOCompletion(
             timestamp_utc=datetime.now(timezone.utc).isoformat(),
-            my_call=self.config.my_call.upper(),
+            my_call=self._my_call_upper,
             other_call=completed_call,
             transcript_rx=list(self.rx_transcript),
             transcript_tx=list(self.tx_transcript),
         )
         self.completions.append(completion)
+        self._completion_dicts.append(_completion_to_dict(completion))
         self._log("INFO", "QSO completado", self.state)
 
         self.state = QSOState.S0_IDLE
-        self._active_other_call_real = self.config.other_call.upper()
-        self._active_other_call = self.config.other_call.upper()
+        self._active_other_call_real = self._other_call_upper
+        self._active_other_call = self._other_call_upper
         self._active_call_selected = False
         self._s2_rr_confirmed = False
         self._active_is_p2p = False
@@ -711,28 +758,28 @@ class QSOStateMachine:
         return self._active_other_call_real
 
     def _select_other_call_for_qso(self) -> str:
-        if self._other_call_pool:
-            return random.choice(self._other_call_pool)
-        return self.config.other_call.upper()
+        pool = self._other_call_pool
+        return random.choice(pool) if pool else self._other_call_upper
 
     def _draw_new_incoming_callers(self) -> List[str]:
         max_stations = max(int(self.config.max_stations), 1)
         requested = random.randint(1, max_stations)
 
-        pool = [c.upper() for c in self._other_call_pool if c.strip()]
+        # set_other_call_pool already stripped, upper-cased and deduplicated the pool.
+        pool = self._other_call_pool
         if not pool:
             self._pending_p2p_real_call = None
-            return [self.config.other_call.upper()]
+            return [self._other_call_upper]
 
         requested = min(requested, len(pool))
         if requested <= 0:
             self._pending_p2p_real_call = None
-            return [self.config.other_call.upper()]
+            return [self._other_call_upper]
         callers = random.sample(pool, requested)
         self._pending_p2p_real_call = self._pick_p2p_caller(callers)
         return callers
 
-    def _emit_callers(self, callers: Sequence[str]) -> List[str]:
+    def _emit_callers(self, callers: Iterable[str]) -> List[str]:
         # Random delay ordering (0..2s per station) is represented as random order.
         ordered = list(callers)
         random.shuffle(ordered)
@@ -740,18 +787,15 @@ class QSOStateMachine:
             ordered.remove(self._pending_p2p_real_call)
             ordered.insert(0, self._pending_p2p_real_call)
         self.state = QSOState.S1_REPLY_CALL
-        replies: List[str] = []
-        for call in ordered:
-            shown = self._display_call(call)
-            reply = self._build_tx_from_template(
-                "caller_call",
-                fallback=f"{shown} {shown}",
-                other_call=shown,
-                extra_values={"CALL": shown},
-            )
-            self.tx_transcript.append(reply)
-            self._log("TX", reply, self.state)
-            replies.append(reply)
+        build = self._build_tx_from_template
+        p2p_real = self._pending_p2p_real_call
+        replies = [
+            build("caller_call", fallback=f"{shown} {shown}", other_call=shown, extra_values={"CALL": shown})
+            for shown in ("P2P" if p2p_real and call == p2p_real else call for call in ordered)
+        ]
+        self.tx_transcript.extend(replies)
+        for reply in replies:
+            self._log("TX", reply, QSOState.S1_REPLY_CALL)
         self.state = QSOState.S2_WAIT_MY_ACK_CALL
         return replies
 
@@ -768,7 +812,7 @@ class QSOStateMachine:
             return None
         if not callers:
             return None
-        return random.choice(list(callers))
+        return random.choice(callers)
 
     def _display_call(self, real_call: str) -> str:
         if self._pending_p2p_real_call and real_call == self._pending_p2p_real_call:
@@ -783,16 +827,17 @@ class QSOStateMachine:
     def _find_exact_pending_call(self, tokens: Sequence[str]) -> Optional[str]:
         if not self._pending_callers:
             return None
-        hay = _compact_join(tokens)
-        best: Optional[Tuple[int, str]] = None
+        by_needle: Dict[str, str] = {}
+        p2p_real = self._pending_p2p_real_call
         for call in self._pending_callers:
-            needle = _compact_token(self._display_call(call))
-            pos = hay.find(needle)
-            if pos < 0:
-                continue
-            if best is None or pos < best[0]:
-                best = (pos, call)
-        return best[1] if best else None
+            shown = "P2P" if p2p_real and call == p2p_real else call
+            by_needle.setdefault(_compact_token(shown), call)
+        # Leftmost match wins and, at equal positions, the alternation order keeps
+        # the earlier pending caller, so one search replaces a find per caller. The
+        # regex engine already skips impossible start positions, so a Python-side
+        # character prefilter per caller would cost more than it saves.
+        m = _compile_needle_union(tuple(by_needle)).search(self._compact_join(tokens))
+        return by_needle[m.group()] if m else None
 
     def _select_pending_station(self, call: str) -> None:
         self._active_other_call_real = call
@@ -807,19 +852,21 @@ class QSOStateMachine:
             self._pending_p2p_real_call = None
         self._active_call_selected = True
         self._s2_rr_confirmed = False
-        self._pending_callers = [c for c in self._pending_callers if c != call]
+        self._pending_callers.pop(call, None)
         if self._pending_p2p_real_call and self._pending_p2p_real_call not in self._pending_callers:
             self._pending_p2p_real_call = None
 
     def _match_pending_by_patterns(self, patterns: Sequence[str]) -> List[str]:
         matches: List[str] = []
         seen = set()
+        p2p_real = self._pending_p2p_real_call
+        shown_calls = [(call, "P2P" if p2p_real and call == p2p_real else call) for call in self._pending_callers]
         for pattern in patterns:
-            for call in self._pending_callers:
-                if call in seen:
-                    continue
-                shown = self._display_call(call)
-                if _wildcard_matches_call(pattern, shown):
+            if not pattern:
+                continue
+            regex = _compile_wildcard(pattern)
+            for call, shown in shown_calls:
+                if call not in seen and regex.fullmatch(shown):
                     seen.add(call)
                     matches.append(call)
         return matches
@@ -836,92 +883,78 @@ class QSOStateMachine:
 
         self._active_call_selected = False
         self._s2_rr_confirmed = False
-        self._pending_callers = self._draw_new_incoming_callers()
+        self._pending_callers = dict.fromkeys(self._draw_new_incoming_callers())
         return self._emit_callers(self._pending_callers)
 
 
-def _render_exchange_pattern(pattern: str, values: Mapping[str, str]) -> str:
-    rendered = pattern
-    for name, value in values.items():
-        rendered = rendered.replace(f"{{{name}}}", re.escape(value))
-    return rendered
+def _export_log_entry(entry: Tuple[int, str, str, str]) -> Dict[str, object]:
+    timestamp_ns, level, state, message = entry
+    ts = _EPOCH_UTC + timedelta(microseconds=timestamp_ns // 1000)
+    return {
+        "timestamp_utc": ts.isoformat(),
+        "level": level,
+        "state": state,
+        "message": message,
+    }
+
+
+def _completion_to_dict(completion: QSOCompletion) -> Dict[str, object]:
+    # Completions are never mutated after creation, so their transcripts can be shared.
+    return {
+        "timestamp_utc": completion.timestamp_utc,
+        "my_call": completion.my_call,
+        "other_call": completion.other_call,
+        "transcript_rx": completion.transcript_rx,
+        "transcript_tx": completion.transcript_tx,
+    }
+
+
+@lru_cache(maxsize=4096)
+def _compile_exchange_pattern(pattern: str, values: Tuple[Tuple[str, str], ...]) -> Pattern[str]:
+    # Keyed on the raw pattern text, so reloading a patterns file needs no invalidation.
+    # Decoded text is Morse-alphabet ASCII, so re.ASCII keeps \w, \d and IGNORECASE
+    # on their cheaper ASCII tables without changing what can match.
+    return re.compile(_render_exchange_template(pattern, _escaped_values(values)), re.ASCII)
+
+
+@lru_cache(maxsize=1024)
+def _compile_exchange_union(patterns: Tuple[str, ...], values: Tuple[Tuple[str, str], ...]) -> Pattern[str]:
+    # One alternation lets a single fullmatch cover every pattern of a key.
+    # Merging renumbers groups, so patterns with backreferences or conditional
+    # group references such as (?(1)...) stay separate.
+    if len(patterns) == 1:
+        return _compile_exchange_pattern(patterns[0], values)
+    if any(_BACKREF_RE.search(p) for p in patterns):
+        raise re.error("group references cannot be merged")
+    escaped = _escaped_values(values)
+    rendered = (_render_exchange_template(p, escaped) for p in patterns)
+    return re.compile("|".join(f"(?:{r})" for r in rendered), re.ASCII)
+
+
+@lru_cache(maxsize=256)
+def _escaped_values(values: Tuple[Tuple[str, str], ...]) -> Dict[str, str]:
+    # Placeholder values are literals inside a regex, so they are escaped once per
+    # value set rather than once per pattern rendered with them.
+    return {name: re.escape(value) for name, value in values}
 
 
 def _render_exchange_template(template: str, values: Mapping[str, str]) -> str:
-    rendered = template
-    for name, value in values.items():
-        rendered = rendered.replace(f"{{{name}}}", value)
-    return rendered
+    # One scan over the template; unknown placeholders and regex quantifiers such
+    # as {2} are left untouched.
+    return _PLACEHOLDER_RE.sub(lambda m: values.get(m.group(1), m.group(0)), template)
 
 
 def _clean_message_spacing(text: str) -> str:
-    return " ".join(part for part in text.split(" ") if part)
+    return _MULTI_SPACE_RE.sub(" ", text).strip(" ")
 
 
-def _contains_subsequence(observed: Sequence[str], required: Sequence[str]) -> Tuple[bool, str]:
-    pos = 0
-    for req in required:
-        found = False
-        while pos < len(observed):
-            if observed[pos] == req:
-                found = True
-                pos += 1
-                break
-            pos += 1
-        if not found:
-            return False, req
-    return True, ""
-
-
-def _contains_subsequence_flexible(observed: Sequence[str], required: Sequence[str]) -> Tuple[bool, str]:
-    ok, missing = _contains_subsequence(observed, required)
-    if ok:
-        return True, ""
-
-    ok_compact, missing_compact = _contains_compact_sequence(observed, required)
-    if ok_compact:
-        return True, ""
-    return False, missing_compact or missing
-
-
-def _count_valid_s2_reports(tokens: Sequence[str]) -> int:
-    direct = sum(1 for tok in tokens if _is_valid_s2_report_token(tok))
-    compact = len(_S2_REPORT_RE.findall(_compact_join(tokens)))
-    return max(direct, compact)
-
-
-def _is_valid_s2_report_token(token: str) -> bool:
-    return _S2_REPORT_RE.fullmatch(_compact_token(token)) is not None
-
-
-def _count_token_flexible(tokens: Sequence[str], token: str) -> int:
-    direct = sum(1 for t in tokens if t == token)
-    compact = _count_compact_occurrences(tokens, token)
-    return max(direct, compact)
-
-
-def _count_token_direct(tokens: Sequence[str], token: str) -> int:
-    return sum(1 for t in tokens if t == token)
-
-
-def _count_compact_occurrences(tokens: Sequence[str], token: str) -> int:
-    needle = _compact_token(token)
-    if not needle:
-        return 0
-    hay = _compact_join(tokens)
-    count = 0
-    start = 0
-    while True:
-        idx = hay.find(needle, start)
-        if idx < 0:
-            break
-        count += 1
-        start = idx + len(needle)
-    return count
-
-
-def _contains_compact_sequence(observed: Sequence[str], required: Sequence[str]) -> Tuple[bool, str]:
-    hay = _compact_join(observed)
+# The compact-token helpers below stay in pure Python on purpose: per-token work
+# is memoized by _compact_token, and the per-character work is str.join,
+# str.find and the in operator, which already run in C.
+def _contains_subsequence_flexible(hay: str, required: Sequence[str]) -> Tuple[bool, str]:
+    # hay is the compact join of the observed tokens. A direct token subsequence
+    # always shows up here too (greedy leftmost find cannot miss an embedding),
+    # so this one scan also covers exact token matches.
     pos = 0
     for req in required:
         needle = _compact_token(req)
@@ -934,112 +967,123 @@ def _contains_compact_sequence(observed: Sequence[str], required: Sequence[str])
     return True, ""
 
 
+def _contains_token_flexible(hay: str, token: str) -> bool:
+    # Every exact token is also a hit in the compact join, and a presence test
+    # stops at the first one instead of counting them all.
+    needle = _compact_token(token)
+    return bool(needle) and needle in hay
+
+
 def _compact_join(tokens: Sequence[str]) -> str:
-    return "".join(_compact_token(tok) for tok in tokens)
+    return "".join(map(_compact_token, tokens))
+
+
+def _compact_tokens(tokens: Sequence[str]) -> List[str]:
+    # Compact forms of the tokens, dropping any that compact to nothing.
+    return [c for c in map(_compact_token, tokens) if c]
 
 
+@lru_cache(maxsize=4096)
 def _compact_token(token: str) -> str:
+    # Received tokens repeat constantly (CQ, DE, calls, reports), so this is cached too.
     tok = token.strip().upper()
     if tok.startswith("<") and tok.endswith(">") and len(tok) > 2:
         tok = tok[1:-1]
     return tok.replace(" ", "")
 
 
+@lru_cache(maxsize=256)
 def _compact_park_ref(token: str) -> str:
     return _compact_token(token).replace("-", "")
 
 
-def _is_repeat_request_for_call(tokens: Sequence[str], call: str) -> bool:
+def _is_full_call_query(compact: Sequence[str], call: str) -> bool:
+    # Single-call form of _full_call_queries that stops at the first hit.
     call_u = call.strip().upper()
-    for tok in tokens:
-        t = tok.strip().upper()
-        if not t:
-            continue
-        if t == "?":
-            return True
-        if "?" in t:
-            # Be permissive: any partial with '?' means "repeat your call".
-            # Example: "K2?" even if decoded prefix is not exact.
+    if not call_u:
+        return False
+    query = call_u + "?"
+    prev = ""
+    for t in compact:
+        if t == query or (t == "?" and prev == call_u):
             return True
-    return False
+        prev = t
+    return "".join(compact) == query
 
 
-def _is_full_call_query(tokens: Sequence[str], call: str) -> bool:
-    call_u = call.strip().upper()
-    if not call_u:
-        return False
-    compact = [_compact_token(t) for t in tokens if _compact_token(t)]
+def _full_call_queries(compact: Sequence[str]) -> Set[str]:
+    # Every call the compact tokens ask for in full ("EA3IMR?", "EA3IMR ?" or the
+    # whole message compacting to "EA3IMR?"), so several candidates share one scan.
+    queried: Set[str] = set()
     joined = "".join(compact)
-    if joined == f"{call_u}?":
-        return True
+    if joined.endswith("?"):
+        queried.add(joined[:-1])
     for i, t in enumerate(compact):
-        if t == f"{call_u}?":
-            return True
-        if t == call_u and i + 1 < len(compact) and compact[i + 1] == "?":
-            return True
-    return False
+        if t.endswith("?"):
+            queried.add(t[:-1])
+        if i + 1 < len(compact) and compact[i + 1] == "?":
+            queried.add(t)
+    queried.discard("")
+    return queried
 
 
-def _wildcard_matches_call(pattern_token: str, call: str) -> bool:
-    if not pattern_token:
-        return False
+@lru_cache(maxsize=256)
+def _compile_needle_union(needles: Tuple[str, ...]) -> Pattern[str]:
+    return re.compile("|".join(map(re.escape, needles)))
+
+
+@lru_cache(maxsize=256)
+def _compile_wildcard(pattern_token: str) -> Pattern[str]:
     # Ham shorthand: '?' means unknown part; treat as wildcard segment.
-    pattern = "^" + re.escape(pattern_token).replace(r"\?", ".*") + "$"
-    try:
-        return re.match(pattern, call) is not None
-    except re.error:
-        return False
+    # Compiled once per query so every pending caller is tested against the same object.
+    return re.compile(re.escape(pattern_token).replace(r"\?", ".*"))
 
 
-def _extract_wildcard_patterns(tokens: Sequence[str]) -> List[str]:
-    compact = [_compact_token(t) for t in tokens if _compact_token(t)]
+def _extract_wildcard_patterns(compact: Sequence[str]) -> List[str]:
+    joined = "".join(compact)
+    if "?" not in joined:
+        return []
+
     patterns: List[str] = []
     seen = set()
-    has_any_question = False
     for tok in compact:
         if "?" not in tok:
             continue
-        has_any_question = True
         # Ignore degenerate patterns like "?" that would match everything.
-        if not any(ch.isalnum() for ch in tok):
+        if _ALNUM_RE.search(tok) is None:
             continue
         if tok in seen:
             continue
         seen.add(tok)
         patterns.append(tok)
 
-    joined = "".join(compact)
-    if "?" in joined:
-        has_any_question = True
-    if "?" in joined and any(ch.isalnum() for ch in joined) and joined not in seen:
+    if _ALNUM_RE.search(joined) is not None and joined not in seen:
         patterns.append(joined)
-    if not patterns and has_any_question:
+    if not patterns:
         # Bare '?' means "repeat all callers in queue".
         patterns.append("?")
     return patterns
 
 
-def _strip_fillers(tokens: Sequence[str], ignore_bk: bool, ignore_tokens: Sequence[str]) -> List[str]:
-    single_char_tokens = sum(1 for t in tokens if len(_compact_token(t)) == 1)
+def _strip_fillers(tokens: Sequence[str], fillers: FrozenSet[str]) -> List[str]:
     # In char-by-char sends (e.g. "U R"), dropping filler tokens like "R"
     # would destroy valid words. In that mode, keep the raw stream.
-    if single_char_tokens >= max(4, int(0.6 * max(len(tokens), 1))):
+    threshold = max(4, int(0.6 * max(len(tokens), 1)))
+    kept: List[str] = []
+    single_char_tokens = 0
+    for t in tokens:
+        if len(_compact_token(t)) == 1:
+            single_char_tokens += 1
+        if t not in fillers:
+            kept.append(t)
+    if single_char_tokens >= threshold:
         return list(tokens)
-
-    fillers = set(ignore_tokens)
-    if ignore_bk:
-        fillers.add("BK")
-    return [t for t in tokens if t not in fillers]
+    return kept
 
 
 def _collapse_double_e(tokens: Sequence[str]) -> List[str]:
-    out: List[str] = []
-    i = 0
-    while i < len(tokens):
-        if i + 1 < len(tokens) and tokens[i] == "E" and tokens[i + 1] == "E":
-            out.append("EE")
-            i += 2
-            continue
-        out.append(tokens[i])
-        i += 1
-    return out
+    if tokens.count("E") < 2:
+        return list(tokens)
+    # Tokens never contain the unit separator, so on the joined stream a
+    # whole-token "E E" pair is "E" bounded by separators or the ends.
+    return _DOUBLE_E_RE.sub("EE", _TOKEN_SEP.join(tokens)).split(_TOKEN_SEP)
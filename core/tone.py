@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import numpy as np
+
+# Sidetone synthesis shared by the encoder and the iambic keyer: a 32-bit
+# fixed-point phase accumulator whose top bits index one sine period.
+SINE_TABLE_SIZE = 4096
+PHASE_BITS = 32
+PHASE_MODULUS = 1 << PHASE_BITS
+PHASE_MASK = PHASE_MODULUS - 1
+PHASE_SHIFT = PHASE_BITS - (SINE_TABLE_SIZE.bit_length() - 1)
+SINE_TABLE = np.sin(2.0 * np.pi * np.arange(SINE_TABLE_SIZE) / SINE_TABLE_SIZE).astype(np.float32)
+
+
+def phase_step(tone_hz: float, sample_rate: float) -> int:
+    """Per-sample phase increment for tone_hz in accumulator units."""
+    return int(round(tone_hz / sample_rate * PHASE_MODULUS)) & PHASE_MASK
@@ -85,3 +85,24 @@ qso:
     )
     cfg = load_config(cfg_path)
     assert cfg.qso.p2p_probability == 1.0
+
+
+def test_load_config_keeps_ignore_fill_tokens_as_tuple(tmp_path: Path):
+    cfg_path = tmp_path / "config.yaml"
+    _write_yaml(
+        cfg_path,
+        """
+qso:
+  ignore_fill_tokens:
+  - RR
+  - DE
+""".strip(),
+    )
+    cfg = load_config(cfg_path)
+    assert cfg.qso.ignore_fill_tokens == ("RR", "DE")
+
+    _write_yaml(cfg_path, "qso:\n  ignore_fill_tokens:\n")
+    assert load_config(cfg_path).qso.ignore_fill_tokens == ()
+
+    _write_yaml(cfg_path, "qso:\n  ignore_fill_tokens: de\n")
+    assert load_config(cfg_path).qso.ignore_fill_tokens == ("DE",)
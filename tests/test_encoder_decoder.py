@@ -176,3 +176,68 @@ def test_short_drop_inside_dot_is_merged_into_single_element():
 def test_short_drop_inside_dash_is_merged_into_single_element():
     recovered = _decode_single_element_with_notch(on_segments=(0.085, 0.085), notch_s=0.010)
     assert recovered == "T"
+
+
+def test_goertzel_power_matches_reference_recurrence():
+    from core.decoder import _goertzel_power, _goertzel_setup
+
+    sample_rate = 16000
+    frame = _tone(0.01, sample_rate=sample_rate, tone_hz=700.0, volume=0.5)
+    frame += np.random.default_rng(7).normal(0.0, 0.05, frame.size).astype(np.float32)
+    for freq in (500.0, 700.0, 913.7):
+        coeff = 2.0 * np.cos(2.0 * np.pi * freq / sample_rate)
+        q1 = q2 = 0.0
+        for sample in frame:
+            q1, q2 = coeff * q1 - q2 + float(sample), q1
+        expected = max(q1 * q1 + q2 * q2 - coeff * q1 * q2, 0.0) / (frame.size * frame.size)
+        coeff, basis = _goertzel_setup(sample_rate, freq, frame.size)
+        power = _goertzel_power(frame, coeff, 1.0 / (frame.size * frame.size), basis)
+        assert abs(power - expected) <= 1e-6 * max(expected, 1e-9)
+
+
+def test_streaming_blocks_of_any_size_decode_like_single_buffer():
+    enc = CWEncoder(CWEncoderConfig(sample_rate=16000, tone_hz=700.0, wpm=22.0, volume=0.9))
+    audio = enc.encode_to_audio("CQ POTA DE EA4XYZ K")
+    cfg = dict(
+        sample_rate=16000,
+        target_tone_hz=700.0,
+        auto_wpm=False,
+        wpm_target=22.0,
+        threshold_on_mult=2.5,
+        threshold_off_mult=1.8,
+        message_gap_dots=8.0,
+    )
+    expected = CWDecoder(CWDecoderConfig(**cfg)).decode_audio(audio)
+
+    dec = CWDecoder(CWDecoderConfig(**cfg))
+    rng = np.random.default_rng(3)
+    messages = []
+    pos = 0
+    while pos < audio.size:
+        n = int(rng.integers(1, 4000))
+        messages.extend(dec.process_samples(audio[pos : pos + n]))
+        pos += n
+    messages.extend(dec.finalize())
+    assert " ".join(messages) == expected
+
+
+def test_pulses_shorter_than_envelope_still_ramp_at_both_ends():
+    cfg = CWEncoderConfig(sample_rate=16000, wpm=30.0, tone_hz=700.0, volume=0.8, attack_ms=40.0, release_ms=60.0)
+    enc = CWEncoder(cfg)
+    audio = enc.encode_to_audio("EE")
+
+    offset = 0
+    for is_on, duration in enc.text_to_pulses("EE"):
+        n = max(int(round(duration * cfg.sample_rate)), 1)
+        if is_on:
+            seg = np.abs(audio[offset : offset + n])
+            assert seg[0] == 0.0
+            assert seg[-1] < 0.01
+            assert seg.max() > 0.9 * cfg.volume
+            up, down = enc._short_pulse_ramps(n)
+            env = np.concatenate([up, down])
+            assert env.size == n
+            assert env.max() > 0.99
+            # No step where the ramps meet: no jump larger than the steeper slope.
+            assert np.abs(np.diff(env)).max() <= 1.0 / min(up.size, down.size) + 1e-6
+        offset += n
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import numpy as np
+
 from core.iambic_keyer import IambicAKeyer, IambicAKeyerConfig
 
 
@@ -67,3 +69,35 @@ def test_iambic_mode_a_stops_without_extra_element_after_release():
     seq = keyer.pop_started_elements()
 
     assert seq == [".", "-"]
+
+
+def test_started_elements_keep_only_the_most_recent_when_not_popped():
+    cfg = IambicAKeyerConfig(sample_rate=8000, wpm=40.0, tone_hz=600.0, volume=0.8)
+    keyer = IambicAKeyer(cfg)
+    keyer.set_paddles(dit=True, dah=False)
+    keyer.render_samples(_samples_for_dots(cfg, 2.0 * 300))
+    keyer.set_paddles(dit=False, dah=True)
+    keyer.render_samples(_samples_for_dots(cfg, 4.0 * 3))
+
+    raw = keyer.pop_started_elements_raw()
+    assert raw.dtype == np.uint8
+    assert raw.size == 256
+    assert raw[-3:].tolist() == [1, 1, 1]
+    assert keyer.pop_started_elements() == []
+
+
+def test_block_batch_matches_consecutive_render_calls():
+    cfg = IambicAKeyerConfig(sample_rate=8000, wpm=22.0, tone_hz=650.0, volume=0.8, attack_ms=2.0, release_ms=3.0)
+    batched = IambicAKeyer(cfg)
+    single = IambicAKeyer(cfg)
+    for keyer in (batched, single):
+        keyer.set_paddles(dit=True, dah=True)
+
+    blocks = batched.render_block_batch(256, 12)
+    expected = np.stack([single.render_samples(256).copy() for _ in range(12)])
+
+    assert blocks.shape == (12, 256)
+    np.testing.assert_allclose(blocks, expected, atol=1e-6)
+    assert batched.pop_started_elements() == single.pop_started_elements()
+    assert batched._scratch.size <= 256
+    assert batched._phase_scratch.size <= 256
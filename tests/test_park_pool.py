@@ -33,3 +33,14 @@ def test_load_active_park_refs_file(tmp_path: Path):
     path.write_text(CSV_SAMPLE, encoding="utf-8")
     refs = load_active_park_refs_file(path)
     assert refs == ["US-0001", "ES-0003"]
+
+
+def test_load_active_park_refs_file_rereads_after_file_changes(tmp_path: Path):
+    path = tmp_path / "parks.csv"
+    path.write_text(CSV_SAMPLE, encoding="utf-8")
+    first = load_active_park_refs_file(path)
+    first.append("XX-9999")
+    assert load_active_park_refs_file(path) == ["US-0001", "ES-0003"]
+
+    path.write_text(CSV_SAMPLE + '\n"EA-0004","D","1","281"', encoding="utf-8")
+    assert load_active_park_refs_file(path) == ["US-0001", "ES-0003", "EA-0004"]
@@ -28,6 +28,16 @@ def test_s0_requires_de_token():
     assert any("DE" in err for err in res.errors)
 
 
+def test_prosign_literal_changes_apply_without_rebuilding_state_machine():
+    sm = QSOStateMachine(_cfg(prosign_literal="KN"))
+    sm.process_text("73 <CAVE> EE")
+    assert sm.rx_transcript[-1] == "73 <KN> EE"
+    sm.config.prosign_literal = "bk"
+    sm.process_text("73 <CAVE> EE")
+    assert sm.rx_transcript[-1] == "73 <BK> EE"
+    assert sm._tx_closing_prosign() == "BK"
+
+
 def test_valid_cq_moves_to_s2_and_single_call_when_max_stations_is_1():
     sm = QSOStateMachine(_cfg(max_stations=1))
     res = sm.process_text("CQ POTA DE EA3IPX K")
@@ -52,6 +62,19 @@ def test_direct_qso_flow_success_single_station():
     assert len(sm.completions) == 1
 
 
+def test_export_session_lists_completed_qsos():
+    sm = QSOStateMachine(_cfg(max_stations=1))
+    assert sm.export_session()["completions"] == []
+    for _ in range(2):
+        assert sm.process_text("CQ POTA DE EA3IPX K").accepted
+        assert sm.process_text("N1MM 5NN 5NN").accepted
+        assert sm.process_text("73 EE").accepted
+
+    exported = sm.export_session()["completions"]
+    assert [c["other_call"] for c in exported] == ["N1MM", "N1MM"]
+    assert exported[-1]["transcript_rx"] == sm.completions[-1].transcript_rx
+
+
 def test_s2_accepts_rst_with_new_digit_ranges():
     sm = QSOStateMachine(_cfg(max_stations=1))
     assert sm.process_text("CQ POTA DE EA3IPX K").accepted
@@ -506,6 +529,56 @@ patterns:
     assert sm.state == QSOState.S5_WAIT_FINAL
 
 
+def test_exchange_patterns_file_accepts_any_of_several_s0_alternatives(tmp_path: Path):
+    patterns_file = tmp_path / "exchange_patterns.yaml"
+    patterns_file.write_text(
+        """
+patterns:
+  s0:
+    SIMPLE:
+      - '^QRL\\?{MY_CALL}K$'
+      - '^(BROKEN$'
+      - '^CQ{MY_CALL}K$'
+""".strip(),
+        encoding="utf-8",
+    )
+
+    for text in ("QRL? EA3IPX K", "CQ EA3IPX K"):
+        sm = QSOStateMachine(
+            _cfg(
+                cq_mode="SIMPLE",
+                max_stations=1,
+                exchange_patterns_file=str(patterns_file),
+            )
+        )
+        assert sm.process_text(text).accepted
+        assert sm.state == QSOState.S2_WAIT_MY_ACK_CALL
+
+
+def test_exchange_patterns_with_conditional_groups_are_not_merged(tmp_path: Path):
+    patterns_file = tmp_path / "exchange_patterns.yaml"
+    patterns_file.write_text(
+        """
+patterns:
+  s0:
+    SIMPLE:
+      - '^(A)?B$'
+      - '^(CQ)?(?(1){MY_CALL}|QRL)K$'
+""".strip(),
+        encoding="utf-8",
+    )
+
+    sm = QSOStateMachine(
+        _cfg(
+            cq_mode="SIMPLE",
+            max_stations=1,
+            exchange_patterns_file=str(patterns_file),
+        )
+    )
+    assert sm.process_text("CQ EA3IPX K").accepted
+    assert sm.state == QSOState.S2_WAIT_MY_ACK_CALL
+
+
 def test_exchange_patterns_file_can_override_tx_templates(tmp_path: Path):
     patterns_file = tmp_path / "exchange_patterns.yaml"
     patterns_file.write_text(
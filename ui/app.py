@@ -9,7 +9,7 @@ import sys
 import threading
 import time
 from collections import deque
-from dataclasses import dataclass, replace
+from dataclasses import asdict, dataclass, replace
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple
@@ -745,16 +745,7 @@ class PotaTrainerWindow(MainWindowBase):
 
         self.decoder = CWDecoder(self.cfg.decoder)
         self.encoder = CWEncoder(self.cfg.encoder)
-        self.keyboard_keyer = IambicAKeyer(
-            IambicAKeyerConfig(
-                sample_rate=self.cfg.audio.sample_rate,
-                wpm=float(self.cfg.decoder.wpm_target),
-                tone_hz=float(self.cfg.decoder.target_tone_hz),
-                volume=float(self.cfg.encoder.volume),
-                attack_ms=float(np.clip(self.cfg.encoder.attack_ms, 0.5, 1.5)),
-                release_ms=float(np.clip(self.cfg.encoder.release_ms, 0.5, 1.5)),
-            )
-        )
+        self.keyboard_keyer = IambicAKeyer(self._keyboard_keyer_config())
         self._keyboard_keyer_lock = threading.Lock()
         self._keyboard_audio_queue: queue.Queue[np.ndarray] = queue.Queue(maxsize=256)
         self._sync_encoder_prosign_tokens()
@@ -1525,6 +1516,16 @@ class PotaTrainerWindow(MainWindowBase):
             except queue.Empty:
                 break
 
+    def _keyboard_keyer_config(self) -> IambicAKeyerConfig:
+        return IambicAKeyerConfig(
+            sample_rate=int(self.cfg.audio.sample_rate),
+            wpm=float(self.cfg.decoder.wpm_target),
+            tone_hz=float(self.cfg.decoder.target_tone_hz),
+            volume=float(self.cfg.encoder.volume),
+            attack_ms=float(np.clip(self.cfg.encoder.attack_ms, 0.5, 1.5)),
+            release_ms=float(np.clip(self.cfg.encoder.release_ms, 0.5, 1.5)),
+        )
+
     def _clear_keyboard_audio_queue(self) -> None:
         while True:
             try:
@@ -1873,11 +1874,13 @@ class PotaTrainerWindow(MainWindowBase):
     def _on_auto_wpm_toggled(self, checked: bool) -> None:
         self.cfg.decoder.auto_wpm = bool(checked)
         self.decoder.config.auto_wpm = bool(checked)
+        self.decoder.apply_config()
         self._log(f"auto_wpm={checked}")
 
     def _on_auto_tone_toggled(self, checked: bool) -> None:
         self.cfg.decoder.auto_tone = bool(checked)
         self.decoder.config.auto_tone = bool(checked)
+        self.decoder.apply_config()
         self._log(f"auto_tone={checked}")
 
     def _on_input_mode_changed(self, _index: int) -> None:
@@ -2055,12 +2058,7 @@ class PotaTrainerWindow(MainWindowBase):
         self.encoder.config.farnsworth_wpm = self.cfg.encoder.farnsworth_wpm
         self.encoder.config.tone_hz = self.cfg.encoder.tone_hz
         with self._keyboard_keyer_lock:
-            self.keyboard_keyer.config.sample_rate = int(self.cfg.audio.sample_rate)
-            self.keyboard_keyer.config.wpm = float(self.cfg.decoder.wpm_target)
-            self.keyboard_keyer.config.tone_hz = float(self.cfg.decoder.target_tone_hz)
-            self.keyboard_keyer.config.volume = float(self.cfg.encoder.volume)
-            self.keyboard_keyer.config.attack_ms = float(np.clip(self.cfg.encoder.attack_ms, 0.5, 1.5))
-            self.keyboard_keyer.config.release_ms = float(np.clip(self.cfg.encoder.release_ms, 0.5, 1.5))
+            self.keyboard_keyer.reconfigure(self._keyboard_keyer_config())
         self._clear_keyboard_audio_queue()
         self._sync_encoder_prosign_tokens()
 
@@ -2117,10 +2115,10 @@ class PotaTrainerWindow(MainWindowBase):
         payload = {
             "timestamp_utc": datetime.now(timezone.utc).isoformat(),
             "config": {
-                "audio": self.cfg.audio.__dict__,
-                "decoder": self.cfg.decoder.__dict__,
-                "encoder": self.cfg.encoder.__dict__,
-                "qso": self.cfg.qso.__dict__,
+                "audio": asdict(self.cfg.audio),
+                "decoder": asdict(self.cfg.decoder),
+                "encoder": asdict(self.cfg.encoder),
+                "qso": asdict(self.cfg.qso),
             },
             "last_decoded": self.last_decoded,
             "last_tx": self.last_tx,